@@ -0,0 +1,136 @@
+"""
+Metrics dashboard shared by the standalone app (app/streamlit_app.py) and the
+multipage app (app/pages/1_Metrics_Dashboard.py).
+
+Only streamlit is imported at module load. The title is drawn before the
+database layer, pandas or plotly are imported, and the engine and query
+cache are built once per server process, so a cold start reaches first
+paint quickly (see scripts/bench_startup.py).
+"""
+import os
+from datetime import datetime
+
+import streamlit as st
+
+
+@st.cache_resource
+def get_dbm():
+    # one engine / connection pool per server process, shared by all sessions
+    from src.db_manager import DBManager
+    return DBManager()
+
+
+@st.cache_resource
+def get_query_cache():
+    # shared by all sessions; dropped when calc_metrics bumps the data version
+    from src.query_cache import QueryCache
+    return QueryCache(get_dbm().get_data_version, max_bytes=int(os.getenv("QUERY_CACHE_MB", "256")) * 2**20)
+
+
+def get_metric_label(metric_name: str, units: dict) -> str:
+    """Return metric name with unit."""
+    unit = units.get(metric_name, "")
+    if unit:
+        return f"{metric_name.replace('_', ' ').title()} ({unit})"
+    return metric_name.replace('_', ' ').title()
+
+
+def render(title: str) -> None:
+    """Draw the dashboard; the caller sets the page config."""
+    st.title(title)
+
+    from src.metric_registry import METRIC_UNITS  # metric/column -> unit
+
+    dbm, cache = get_dbm(), get_query_cache()
+
+    with st.sidebar:
+        st.header("Filters")
+        dims = cache.get("dimensions", (), dbm.metric_dimensions)
+        if not dims["metrics"]:
+            st.warning("No metrics found. Run loader and calc scripts first.")
+            st.stop()
+        companies = dims["companies"]
+        default_comp = companies[0] if companies else None
+        selected_companies = st.multiselect("Companies", companies, default=[default_comp] if default_comp else [])
+
+        # Display metrics with units in dropdown
+        metric_display = {m: get_metric_label(m, METRIC_UNITS) for m in dims["metrics"]}
+        selected_metric_display = st.selectbox("Metric", options=list(metric_display.values()))
+        selected_metric = [k for k, v in metric_display.items() if v == selected_metric_display][0]
+
+        ymin, ymax = dims["years"]
+        year_range = st.slider("Year range", ymin, ymax, (ymin, ymax)) if ymin < ymax else (ymin, ymax)
+        # cached results are reused until the data version changes; this only re-runs the page
+        if st.button("Refresh data"):
+            st.rerun()
+
+    import pandas as pd
+
+    companies_key, years_key = tuple(selected_companies), tuple(year_range)
+    # filters run in SQL; only the selected series is transferred
+    main_df = cache.get(
+        "metric", (selected_metric, companies_key, years_key),
+        lambda: dbm.query_metrics(selected_metric, companies=selected_companies, year_range=year_range),
+    )
+    unit = METRIC_UNITS.get(selected_metric, "")
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        metric_label = get_metric_label(selected_metric, METRIC_UNITS)
+        st.subheader(f"{metric_label} — {', '.join(selected_companies) if selected_companies else 'All companies'}")
+        if main_df.empty:
+            st.info("No data for selected filters.")
+        else:
+            import plotly.express as px
+
+            # Line chart with unit in y-axis
+            fig = px.line(main_df, x="year", y="value", color="company", markers=True,
+                          labels={"value": metric_label, "year": "Year", "company": "Company"})
+            fig.update_layout(
+                legend_title_text="Company",
+                xaxis=dict(dtick=1),
+                yaxis_title=metric_label,
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.subheader("Summary")
+        summary = pd.DataFrame()
+        if years_key == tuple(dims["years"]):
+            # precomputed per (company, metric) rollup, maintained by calc_metrics
+            summary = cache.get(
+                "summary", (selected_metric, companies_key),
+                lambda: dbm.get_metric_summaries(selected_metric, companies=selected_companies),
+            )
+        if summary.empty and not main_df.empty:
+            # narrowed year range or raw fact column: summarize the loaded series
+            summary = main_df.groupby("company").agg(
+                latest_year=("year", "max"), min_value=("value", "min"), max_value=("value", "max")
+            ).reset_index()
+            summary["latest_value"] = main_df.loc[main_df.groupby("company")["year"].idxmax(), "value"].to_numpy()
+            summary["cagr"] = float("nan")
+        if summary.empty:
+            st.write("—")
+        else:
+            value_format = f"%.2f {unit.replace('%', '%%')}".strip()  # printf-style: escape a literal %
+            st.dataframe(
+                summary.set_index("company")[["latest_year", "latest_value", "min_value", "max_value", "cagr"]],
+                column_config={
+                    "latest_year": st.column_config.NumberColumn("Latest Year", format="%d"),
+                    "latest_value": st.column_config.NumberColumn(f"Latest Value ({unit})", format=value_format),
+                    "min_value": st.column_config.NumberColumn("Min", format=value_format),
+                    "max_value": st.column_config.NumberColumn("Max", format=value_format),
+                    "cagr": st.column_config.NumberColumn("CAGR (%/yr)", format="%.2f"),
+                },
+            )
+
+    st.markdown("---")
+    st.subheader("Data table")
+    main_df_display = main_df.copy()
+    main_df_display["value_formatted"] = main_df_display["value"].apply(
+        lambda x: f"{x:.2f} {unit}".strip() if pd.notna(x) else "—"
+    )
+    st.dataframe(main_df_display[["company", "ticker", "year", "value_formatted"]].rename(columns={"value_formatted": f"Value ({unit})"}).reset_index(drop=True))
+
+    csv = main_df.to_csv(index=False)
+    st.download_button("Download CSV", csv, file_name=f"metrics_{selected_metric}_{datetime.utcnow().date()}.csv", mime="text/csv")
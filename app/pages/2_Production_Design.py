@@ -78,15 +78,15 @@ col1, col2 = st.columns([1, 1])
 
 with col1:
     st.code("""
-# Daily batch strategy
-def get_companies_to_update():
-    # Query companies not updated in 30 days
-    return db.query(Company).filter(
-        Company.last_updated < 
-        datetime.now() - timedelta(days=30)
-    ).order_by(
-        Company.last_updated.asc()
-    ).limit(8)  # 8 companies × 3 = 24 calls
+# Daily batch strategy (src/refresh_queue.py, used by src/main.py)
+queue = RefreshQueue("data/refresh_queue.json", max_age_days=30)
+queue.sync(COMPANIES)  # universe from COMPANIES_FILE
+
+# Due = data older than 30 days, or older than 7 days while
+# the next 10-K is expected; failing tickers back off 1, 2, 4... days.
+# Ordered by overdue-ness + filing window boost - failure penalty.
+budget = rate_limiter.remaining_today()   # persisted 25/day counter
+batch = queue.next_batch(budget // 3)     # 8 companies × 3 = 24 calls
 
 # n8n runs daily, processes 8 companies
 # Full cycle: 100 ÷ 8 = 12.5 days
@@ -97,8 +97,8 @@ with col2:
     **Enhancements:**
     
     1. **Priority Queue**
-       - Process earnings season companies first
-       - Flag stale data (>60 days old)
+       - Process companies in their filing window first
+       - Stalest data next; failing tickers back off
     
     2. **Exponential Backoff**
        ```python
@@ -108,9 +108,10 @@ with col2:
            ...
        ```
     
-    3. **Response Caching**
-       - Store ETag headers
-       - Skip unchanged data
+    3. **Response Caching** (`src/response_cache.py`)
+       - Serve statements from `data/cache/` until they are 30 days old
+       - Revalidate stale ones via ETag / Last-Modified / body hash
+       - Only stale tickers cost API calls
     """)
 
 st.info("**Note:** For real-time needs, consider Alpha Vantage Premium ($50/mo = 120 calls/min)")
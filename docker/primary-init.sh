@@ -0,0 +1,3 @@
+#!/bin/bash
+# Runs once when the `db` volume is initialized: let the `db-replica` service stream WAL.
+echo "host replication all all ${POSTGRES_HOST_AUTH_METHOD:-scram-sha-256}" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,13 @@
+#!/bin/bash
+# Hot-standby streaming replica of the `db` service, for trying DATABASE_READ_URL locally.
+# The first start clones the primary with pg_basebackup; later starts resume streaming.
+set -euo pipefail
+PGDATA=/var/lib/postgresql/data
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until pg_isready -h db -U "$PGUSER" >/dev/null 2>&1; do sleep 1; done
+  chown postgres:postgres "$PGDATA"
+  chmod 700 "$PGDATA"
+  gosu postgres pg_basebackup -h db -U "$PGUSER" -D "$PGDATA" -R -X stream
+fi
+exec gosu postgres postgres -D "$PGDATA" -c hot_standby=on
@@ -0,0 +1,95 @@
+"""
+Benchmark statement loading: batched INSERT ... ON CONFLICT vs the PostgreSQL COPY path.
+
+Synthetic quarterly-style rows are written for a set of throwaway companies
+in the database pointed to by DATABASE_URL, then removed again. On SQLite the
+COPY path falls back to the batched path, so both numbers are comparable.
+
+    DATABASE_URL=postgresql+psycopg2://... python scripts/bench_load.py --companies 500 --periods 40
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.db import engine
+from src.db_manager import DBManager
+from src.models import Company, FinancialStatement
+
+BENCH_PREFIX = "__bench__ "
+
+
+def make_rows(company_ids, periods: int):
+    rng = random.Random(42)
+    for cid in company_ids:
+        for i in range(periods):
+            year, quarter = 1990 + i // 4, i % 4
+            revenue = rng.uniform(1e8, 1e10)
+            yield {
+                "company_id": cid,
+                "statement_type": "income_statement",
+                "period": "quarterly",
+                "fiscal_date": date(year, 3 * quarter + 1, 28),
+                "data": {"fiscalDateEnding": f"{year}-{3 * quarter + 1:02d}-28", "totalRevenue": str(int(revenue))},
+                "revenue": revenue,
+                "gross_profit": revenue * 0.3,
+                "net_income": revenue * 0.1,
+                "currency": "USD",
+            }
+
+
+def cleanup(dbm: DBManager) -> None:
+    with dbm.session() as s:
+        ids = [c.id for c in s.query(Company).filter(Company.name.like(f"{BENCH_PREFIX}%"))]
+        if ids:
+            s.query(FinancialStatement).filter(FinancialStatement.company_id.in_(ids)).delete(synchronize_session=False)
+            s.query(Company).filter(Company.id.in_(ids)).delete(synchronize_session=False)
+    dbm.prune_payloads()
+
+
+def timed(label: str, fn, rows) -> None:
+    start = time.perf_counter()
+    written = fn(rows)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34}{written:>9} rows {elapsed:8.2f}s {written / elapsed:>11,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--periods", type=int, default=40, help="Reports per company")
+    args = parser.parse_args()
+
+    dbm = DBManager(engine)
+    dbm.create_tables()
+    cleanup(dbm)
+    try:
+        ids = [
+            dbm.upsert_company(name=f"{BENCH_PREFIX}{i}", ticker=f"B{i:05d}").id
+            for i in range(args.companies)
+        ]
+        rows = list(make_rows(ids, args.periods))
+        copy_label = "COPY + merge" if engine.dialect.name == "postgresql" else "COPY (fallback: batched)"
+        print(f"{engine.dialect.name}: {len(rows)} rows for {len(ids)} companies")
+        # each path runs twice: once inserting fresh rows, once updating them all
+        timed("batched insert", dbm.bulk_upsert_financial_statements, rows)
+        timed("batched update", dbm.bulk_upsert_financial_statements, rows)
+        cleanup(dbm)
+        ids = [
+            dbm.upsert_company(name=f"{BENCH_PREFIX}{i}", ticker=f"B{i:05d}").id
+            for i in range(args.companies)
+        ]
+        rows = list(make_rows(ids, args.periods))
+        timed(f"{copy_label} insert", dbm.copy_upsert_financial_statements, rows)
+        timed(f"{copy_label} update", dbm.copy_upsert_financial_statements, rows)
+    finally:
+        cleanup(dbm)
+
+
+if __name__ == "__main__":
+    main()
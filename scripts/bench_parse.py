@@ -0,0 +1,99 @@
+"""
+Benchmark scalar vs batch parsing (parse_number/parse_numbers, parse_date/parse_dates)
+and per-report vs per-list normalization (normalize_fields/normalize_reports) on the
+raw Alpha Vantage reports in console_dump.json, and check both agree.
+
+    python scripts/bench_parse.py --repeat 20
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.utils import (
+    STATEMENT_COLUMNS, normalize_fields, normalize_reports, parse_date, parse_dates, parse_number, parse_numbers,
+)
+
+TEXT_FIELDS = ("fiscalDateEnding", "reportedCurrency")
+
+
+def columns(path: Path):
+    """(every numeric field value, every fiscalDateEnding) across all reports in ``path``."""
+    numbers, dates = [], []
+    for statements in json.loads(path.read_text(encoding="utf-8")).values():
+        for payload in statements.values():
+            if not isinstance(payload, dict):
+                continue
+            for rep in payload.get("annualReports", []) + payload.get("quarterlyReports", []):
+                dates.append(rep.get("fiscalDateEnding"))
+                numbers.extend(v for k, v in rep.items() if k not in TEXT_FIELDS)
+    return numbers, dates
+
+
+def report_lists(path: Path):
+    """(statement_type, annualReports) of every statement in ``path``."""
+    return [
+        (stype, payload.get("annualReports", []))
+        for statements in json.loads(path.read_text(encoding="utf-8")).values()
+        for stype, payload in statements.items()
+        if isinstance(payload, dict)
+    ]
+
+
+def same(a, b) -> bool:
+    return all(x == y or (isinstance(x, float) and math.isnan(x) and math.isnan(y)) for x, y in zip(a, b))
+
+
+def timed(label: str, fn, values, repeat: int, count: int = None):
+    count = len(values) if count is None else count
+    fn(values)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(values)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<22}{count:>8} items {elapsed * 1000:9.2f} ms  {count / elapsed / 1e6:6.2f} M/s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--path", type=Path, default=ROOT / "console_dump.json")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the dump's columns this many times")
+    args = parser.parse_args()
+
+    numbers, dates = columns(args.path)
+    numbers, dates = numbers * args.scale, dates * args.scale
+    for name, scalar, batch, values in (
+        ("numbers", parse_number, parse_numbers, numbers),
+        ("dates", parse_date, parse_dates, dates),
+    ):
+        expected, t_scalar = timed(f"{scalar.__name__}", lambda vs: [scalar(v) for v in vs], values, args.repeat)
+        got, t_batch = timed(f"{batch.__name__}", batch, values, args.repeat)
+        if len(got) != len(expected) or not same(got, expected):
+            print(f"MISMATCH between {scalar.__name__} and {batch.__name__}")
+            sys.exit(1)
+        print(f"{name}: {t_scalar / t_batch:.1f}x faster, identical results")
+
+    lists = report_lists(args.path) * args.scale
+    reports = [(stype, rep) for stype, reps in lists for rep in reps]
+    expected, t_scalar = timed("normalize_fields", lambda rs: [normalize_fields(r, t) for t, r in rs], reports, args.repeat)
+    got, t_batch = timed(
+        "normalize_reports", lambda ls: [v for t, rs in ls for v in normalize_reports(rs, t, STATEMENT_COLUMNS[t])],
+        lists, args.repeat, count=len(reports),
+    )
+    if got != expected:
+        print("MISMATCH between normalize_fields and normalize_reports")
+        sys.exit(1)
+    print(f"statement columns: {t_scalar / t_batch:.1f}x faster, identical results")
+    timed("normalize_reports all", lambda ls: [normalize_reports(rs, t) for t, rs in ls], lists, args.repeat,
+          count=len(reports))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark metric reads: ORM objects -> DataFrame vs the streamed Core/Arrow path.
+
+Synthetic metrics are written for a set of throwaway companies in the
+database pointed to by DATABASE_URL, read back both ways, then removed.
+
+    DATABASE_URL=postgresql+psycopg2://... python scripts/bench_read.py --companies 2000 --years 50
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+import pyarrow as pa
+
+from src.db import engine
+from src.db_manager import DBManager
+from src.models import Company, Metric
+
+BENCH_PREFIX = "__bench__ "
+METRICS = ("gross_margin", "net_margin", "revenue_yoy", "roa", "debt_ratio")
+
+
+def cleanup(dbm: DBManager) -> None:
+    with dbm.session() as s:
+        ids = [c.id for c in s.query(Company).filter(Company.name.like(f"{BENCH_PREFIX}%"))]
+        if ids:
+            s.query(Metric).filter(Metric.company_id.in_(ids)).delete(synchronize_session=False)
+            s.query(Company).filter(Company.id.in_(ids)).delete(synchronize_session=False)
+
+
+def orm_frame(dbm: DBManager) -> pd.DataFrame:
+    """The pre-Arrow dashboard path: hydrate ORM objects, then build the frame row by row."""
+    rows = [
+        {"company_id": m.company_id, "year": int(m.year), "metric_name": m.metric_name,
+         "value": float(m.value) if m.value is not None else None}
+        for m in dbm.get_metrics()
+    ]
+    return pd.DataFrame(rows)
+
+
+def timed(label: str, fn) -> None:
+    # timing and peak memory come from separate runs; tracemalloc slows allocation-heavy code.
+    # tracemalloc does not see Arrow's memory pool, so the retained Arrow bytes are reported apart.
+    gc.collect()
+    start = time.perf_counter()
+    n = len(fn())
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow = pa.total_allocated_bytes() - arrow_before
+    del result
+    print(f"{label:<24}{n:>10} rows {elapsed:8.2f}s  peak {peak / 2**20:8.1f} MiB  arrow {arrow / 2**20:6.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--years", type=int, default=40, help="Years of metrics per company")
+    args = parser.parse_args()
+
+    dbm = DBManager(engine)
+    dbm.create_tables()
+    cleanup(dbm)
+    try:
+        ids = [
+            dbm.upsert_company(name=f"{BENCH_PREFIX}{i}", ticker=f"B{i:05d}").id
+            for i in range(args.companies)
+        ]
+        rng = random.Random(42)
+        rows = [
+            {"company_id": cid, "year": 1980 + y, "metric_name": name, "value": rng.uniform(-50, 50)}
+            for cid in ids for y in range(args.years) for name in METRICS
+        ]
+        dbm.bulk_upsert_metrics(rows)
+        print(f"{engine.dialect.name}: reading {len(rows)} bench metrics (plus any existing ones)")
+        timed("ORM -> DataFrame", lambda: orm_frame(dbm))
+        timed("Core -> Arrow -> pandas", lambda: dbm.read_metrics(as_frame=True))
+        timed("Core -> Arrow table", dbm.read_metrics)
+    finally:
+        cleanup(dbm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measure dashboard cold-start cost: each phase runs in a fresh interpreter.
+
+Phases are cumulative, in the order the dashboard pays for them: the
+modules imported before the title is drawn, the first database round trip
+(DBManager + sidebar dimensions), then pandas/plotly for the chart. The
+streamlit phases are skipped when streamlit is not installed.
+
+    python scripts/bench_startup.py --runs 5 --budget 2.0
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# (label, code, modules it needs, counts towards first paint)
+PHASES = [
+    ("streamlit + app.dashboard", "import streamlit, app.dashboard", ("streamlit",), True),
+    ("src.metric_registry", "import src.metric_registry", (), True),
+    ("DBManager + dimensions", "from src.db_manager import DBManager; DBManager().metric_dimensions()", (), True),
+    ("pandas + plotly", "import pandas, plotly.express", ("plotly",), False),
+]
+
+
+def run_phase(code: str) -> float:
+    """Wall time of a fresh interpreter running ``code`` from the repo root."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {str(ROOT)!r}); {code}"],
+                   cwd=ROOT, env=os.environ.copy(), check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per phase (median is reported)")
+    parser.add_argument("--budget", type=float, default=None, help="Fail if time to first paint exceeds this many seconds")
+    args = parser.parse_args()
+
+    previous = statistics.median(run_phase("pass") for _ in range(args.runs))
+    print(f"{'interpreter':<28}{previous:8.2f}s")
+    code, first_paint = "pass", 0.0
+    for label, phase_code, modules, before_paint in PHASES:
+        missing = [m for m in modules if importlib.util.find_spec(m) is None]
+        if missing:
+            print(f"{label:<28}  skipped ({', '.join(missing)} not installed)")
+            continue
+        # each phase runs after the previous ones, so its time is the increment it adds
+        code = f"{code}; {phase_code}"
+        total = statistics.median(run_phase(code) for _ in range(args.runs))
+        elapsed, previous = max(total - previous, 0.0), total
+        print(f"{label:<28}{elapsed:8.2f}s")
+        if before_paint:
+            first_paint += elapsed
+    print(f"{'time to first paint':<28}{first_paint:8.2f}s (sum of phases before the chart)")
+    if args.budget is not None and first_paint > args.budget:
+        print(f"Over budget: {first_paint:.2f}s > {args.budget:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
+import argparse
+import os
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import logging
-from datetime import datetime
-from typing import Optional
+
+import pandas as pd
 
 # ensure repo root is on sys.path so "from src ..." imports work
 ROOT = Path(__file__).resolve().parents[1]
@@ -10,7 +13,8 @@ sys.path.insert(0, str(ROOT))
 
 from src.db_manager import DBManager
 from src.db import engine
-from src.utils import parse_number
+from src.metric_engine import compute_metrics, restrict_to_changes, to_rows
+from src.metric_registry import required_columns, resolve
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,93 +22,97 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def year_from_fs(fs) -> int:
-    """Extract year from financial statement fiscal_date or data."""
-    if fs.fiscal_date:
-        return fs.fiscal_date.year
-    d = fs.data.get("fiscalDateEnding") or fs.data.get("fiscal_date")
-    try:
-        return datetime.fromisoformat(d).year
-    except Exception:
-        try:
-            return int(str(d)[:4])
-        except Exception:
-            return None
-
-def safe_divide(numerator: float, denominator: float) -> Optional[float]:
-    """Safe division returning None if denominator is zero or None."""
-    if denominator is None or numerator is None or denominator == 0:
-        return None
-    return numerator / denominator
+# pipeline_state entry: latest financial_facts.updated_at already reflected in metrics
+WATERMARK = "metrics"
+# rows are stamped when a load transaction writes them but only visible once it commits; the
+# stored watermark stays this far behind the run, so rows of a load that committed after a
+# later one was seen are picked up next run (set to the longest expected load transaction)
+WATERMARK_LAG = timedelta(seconds=int(os.getenv("METRICS_WATERMARK_LAG", "900")))
 
-def calc_and_persist() -> None:
+def calc_and_persist(full: bool = False) -> None:
     """
     Calculate financial metrics from normalized columns and persist to metrics table.
-    Handles errors gracefully and logs statistics.
+    Every registered metric (src/metric_registry.py) is evaluated from one
+    query over financial_facts (one row per company and fiscal year), in one
+    vectorized pass, then bulk-written.
+
+    Only (company, year) pairs whose facts changed since the last run are
+    rewritten, plus the following year's lagged metrics; the first run, or
+    ``full=True``, recomputes everything. Metrics of years whose facts are
+    gone are deleted and the rest of that company is recomputed. The data
+    version is only bumped when stored metrics actually changed. Handles
+    errors gracefully and logs statistics.
     """
     dbm = DBManager(engine)
-    companies = dbm.get_companies()
+    dbm.create_tables()
     total_metrics = 0
     failed = 0
 
-    for comp in companies:
-        try:
-            logger.info(f"Calculating metrics for {comp.name} ({comp.ticker})")
-            
-            # Use normalized columns instead of parsing JSON
-            reports = dbm.fetch_financials(
-                company_id=comp.id, 
-                statement_type="income_statement", 
-                period="annual"
-            )
-            
-            # Build dicts by year using normalized columns
-            rev_by_year = {}
-            gross_by_year = {}
-            net_by_year = {}
-            years = set()
-            
-            for r in reports:
-                yr = year_from_fs(r)
-                if yr is None:
-                    logger.warning(f"No year for report {r.id}, skipping")
-                    continue
-                years.add(yr)
-                # Use normalized columns directly
-                rev_by_year[yr] = r.revenue
-                gross_by_year[yr] = r.gross_profit
-                net_by_year[yr] = r.net_income
+    watermark = None if full else dbm.get_watermark(WATERMARK)
+    # read before computing so changes landing meanwhile are picked up next run
+    high_water = dbm.latest_fact_change()
+    # every row not yet committed now is stamped after now - WATERMARK_LAG
+    safe_water = datetime.now(timezone.utc) - WATERMARK_LAG
+    if high_water is not None:
+        if high_water.tzinfo is None:  # SQLite drops the offset of UTC stamps
+            high_water = high_water.replace(tzinfo=timezone.utc)
+        safe_water = min(high_water, safe_water)
 
-            years = sorted(years)
-            
-            for i, yr in enumerate(years):
-                rev = rev_by_year.get(yr)
-                gross = gross_by_year.get(yr)
-                net = net_by_year.get(yr)
-                prev_rev = rev_by_year.get(years[i-1]) if i > 0 else None
-
-                # Calculate metrics with safe division
-                metrics = {
-                    "gross_margin": safe_divide(gross, rev) * 100 if safe_divide(gross, rev) else None,
-                    "net_margin": safe_divide(net, rev) * 100 if safe_divide(net, rev) else None,
-                    "revenue_yoy": safe_divide((rev - prev_rev) if prev_rev and rev else None, prev_rev) * 100 if prev_rev and safe_divide(rev - prev_rev, prev_rev) else None,
-                }
-
-                for name, val in metrics.items():
-                    try:
-                        dbm.upsert_metric(company_id=comp.id, year=yr, metric_name=name, value=val)
-                        total_metrics += 1
-                    except Exception as e:
-                        logger.error(f"Failed to upsert metric {name} for {comp.name} year {yr}: {e}")
-                        failed += 1
+    try:
+        metric_defs = resolve()
+        columns = required_columns(metric_defs)
+        # deleted facts leave no updated_at behind, so look for metrics they no longer back
+        orphans = dbm.orphan_metric_years()
+        if watermark is None:
+            logger.info(f"Full recomputation of {len(metric_defs)} metrics")
+            frame = dbm.fetch_facts_frame(columns)
+            metrics = compute_metrics(frame, metric_defs)
+        else:
+            changed = {(cid, d.year) for cid, d in dbm.fetch_changed_facts(watermark)}
+            if not changed and not orphans:
+                logger.info(f"No fact changes since {watermark}; metrics are up to date")
+                print("Metrics up to date (0 total, 0 failed)")
+                return
+            companies = sorted({cid for cid, _ in changed | orphans})
+            logger.info(f"Recomputing metrics for {len(changed)} changed and {len(orphans)} removed "
+                        f"company-years across {len(companies)} companies")
+            frame = dbm.fetch_facts_frame(columns, company_ids=companies)
+            # lagged metrics of the years after a removed one now compare against another year
+            pruned = frame[frame["company_id"].isin({cid for cid, _ in orphans})]
+            changed |= set(zip(pruned["company_id"], pd.to_datetime(pruned["fiscal_date"]).dt.year))
+            metrics = restrict_to_changes(compute_metrics(frame, metric_defs), changed)
+        logger.info(f"Calculated metrics from {len(frame)} fact rows "
+                    f"for {frame['company_id'].nunique() if not frame.empty else 0} companies")
+        rows = to_rows(metrics)
+    except Exception as e:
+        logger.error(f"Failed to calculate metrics: {e}")
+        print("Metrics calculation failed")
+        return
 
-        except Exception as e:
-            logger.error(f"Failed to calculate metrics for {comp.name}: {e}")
-            failed += 1
-            continue
+    # metrics, watermark and data version commit together: a failed write leaves all three unchanged
+    changed_metrics = 0
+    try:
+        with dbm.unit_of_work():
+            # counts only rows whose value changed, so re-scanning the lag window is free
+            changed_metrics = dbm.bulk_upsert_metrics(rows)
+            changed_metrics += dbm.prune_metrics(orphans) if orphans else 0
+            # tables that predate updated_at hold NULLs; later changes are stamped after now
+            dbm.set_watermark(WATERMARK, safe_water)
+            # tells dashboard caches that stored data changed
+            version = dbm.bump_data_version() if changed_metrics else None
+        total_metrics += len(rows)
+        if version is not None:
+            logger.info(f"Data version bumped to {version}")
+    except Exception as e:
+        logger.error(f"Failed to bulk upsert {len(rows)} metrics: {e}")
+        failed += len(rows)
+        changed_metrics = 0
 
-    logger.info(f"Metrics calculation complete: {total_metrics} persisted, {failed} failed")
+    logger.info(f"Metrics calculation complete: {total_metrics} persisted ({changed_metrics} changed), {failed} failed")
     print(f"Metrics calculated and persisted ({total_metrics} total, {failed} failed)")
 
 if __name__ == "__main__":
-    calc_and_persist()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Calculate metrics from loaded financial statements")
+    parser.add_argument("--full", action="store_true", help="Recompute every metric, ignoring the change watermark")
+    args = parser.parse_args()
+    calc_and_persist(full=args.full)
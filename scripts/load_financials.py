@@ -1,8 +1,15 @@
+import argparse
+import json
+import multiprocessing
 import os
+import queue
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
 from pathlib import Path
-import json
-from typing import Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 import logging
 from dotenv import load_dotenv
 
@@ -14,8 +21,10 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from src.db import engine
-from src.db_manager import DBManager
-from src.utils import parse_date, normalize_fields
+from src.db_manager import DBManager, BULK_CHUNK_SIZE, COPY_CHUNK_SIZE
+from src.utils import STATEMENT_COLUMNS, normalize_fields, normalize_reports, parse_date, parse_dates
+from src.json_stream import JSONStreamReader
+from src.raw_store import RawStore
 
 # Configure logging
 logging.basicConfig(
@@ -25,87 +34,412 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 DATA_PATH = Path("data/financial_data.json")
+RAW_DIR = Path(os.getenv("RAW_DIR", "data/raw"))
+LOAD_STATE_PATH = RAW_DIR / "loaded.json"  # {TICKER/statement_type: sha256 last loaded}
+# reports per process-pool task when --workers splits a legacy JSON file
+NORMALIZE_CHUNK = int(os.getenv("LOAD_NORMALIZE_CHUNK", "1000"))
+# per-statement outcomes counted by flush_rows (see DBManager.sync_financial_statements)
+WRITE_COUNTS = ("inserted", "updated", "unchanged")
 
 def ensure_tables(dbm: DBManager) -> None:
     """Create database tables if they don't exist."""
     dbm.create_tables()
     logger.info("Tables ensured")
 
-def load() -> None:
+STATEMENT_TYPES = ("income_statement", "balance_sheet", "cash_flow_statement")
+
+def iter_reports(path: Path, stats: dict) -> Iterator[Tuple[str, str, str, dict]]:
     """
-    Load financial data from JSON file into database.
-    Handles errors gracefully and logs statistics.
+    Stream (company_name, ticker, statement_type, report) from the extracted JSON file.
+
+    The file is walked incrementally, one company and one annual report at a
+    time, so memory use does not grow with the file size.
     """
-    dbm = DBManager(engine)
-    ensure_tables(dbm)
+    with open(path, encoding="utf-8") as f:
+        reader = JSONStreamReader(f)
+        for company_name in reader.iter_object():
+            if reader.peek() != "{":
+                reader.skip_value()
+                logger.warning(f"No statements for {company_name}, skipping")
+                stats["skipped"] += 1
+                continue
+            ticker: Optional[str] = None
+            pending = []  # reports seen before the company's ticker
+            for stype in reader.iter_object():
+                if stype not in STATEMENT_TYPES or reader.peek() != "{":
+                    reader.skip_value()
+                    continue
+                for field in reader.iter_object():
+                    if field == "symbol":
+                        symbol = reader.read_value()
+                        ticker = ticker or symbol
+                    elif field == "annualReports" and reader.peek() == "[":
+                        for _ in reader.iter_array():
+                            rep = reader.read_value()
+                            if ticker:
+                                yield company_name, ticker, stype, rep
+                            else:
+                                pending.append((stype, rep))
+                    else:
+                        reader.skip_value()
+                    if ticker and pending:
+                        for p_stype, p_rep in pending:
+                            yield company_name, ticker, p_stype, p_rep
+                        pending = []
+            if not ticker:
+                logger.warning(f"No ticker found for {company_name}, skipping")
+                stats["skipped"] += 1
 
-    if not DATA_PATH.exists():
-        logger.error(f"{DATA_PATH} not found")
-        return
+def iter_normalized(records: Iterable[Tuple[str, str, str, dict]], stats: dict) -> Iterator[Tuple[str, str, dict]]:
+    """
+    Parse fiscal dates and normalize fields, yielding (company_name, ticker, statement row).
+    Consecutive reports of one company and statement type are normalized as a batch.
+    """
+    for (company_name, ticker, stype), group in groupby(records, key=lambda r: r[:3]):
+        reports = [rep for _, _, _, rep in group]
+        try:
+            fiscals = parse_dates([rep.get("fiscalDateEnding") or rep.get("fiscal_date") for rep in reports])
+            fields = normalize_reports(reports, stype, STATEMENT_COLUMNS.get(stype))
+        except Exception:
+            # a malformed report: redo the batch one by one so only it is counted as failed
+            yield from iter_normalized_one(company_name, ticker, stype, reports, stats)
+            continue
+        for rep, fiscal, values in zip(reports, fiscals, fields):
+            if not fiscal:
+                logger.warning(f"No fiscal date for {company_name} {stype}, skipping report")
+                continue
+            yield company_name, ticker, dict(statement_type=stype, period="annual", fiscal_date=fiscal, data=rep, **values)
+
+def iter_normalized_one(
+    company_name: str, ticker: str, stype: str, reports: List[dict], stats: dict
+) -> Iterator[Tuple[str, str, dict]]:
+    """Per-report fallback of iter_normalized."""
+    for rep in reports:
+        fiscal = None
+        try:
+            fiscal = parse_date(rep.get("fiscalDateEnding") or rep.get("fiscal_date"))
+            if not fiscal:
+                logger.warning(f"No fiscal date for {company_name} {stype}, skipping report")
+                continue
+            row = dict(
+                statement_type=stype,
+                period="annual",
+                fiscal_date=fiscal,
+                data=rep,
+                **normalize_fields(rep, stype)  # revenue, gross_profit, net_income, etc.
+            )
+        except Exception as e:
+            logger.error(f"Failed to normalize statement for {company_name} ({stype}, {fiscal}): {e}")
+            stats["failed"] += 1
+            continue
+        yield company_name, ticker, row
+
+def iter_landed_reports(store: RawStore, entry: dict) -> Iterator[Tuple[str, str, str, dict]]:
+    """Stream annual (company_name, ticker, statement_type, report) records of one landed file."""
+    for rec in store.iter_records(entry):
+        if rec.get("period", "annual") == "annual":
+            yield rec["company"], rec["symbol"], rec["statement_type"], rec["report"]
 
+def flush_rows(
+    dbm: DBManager,
+    batch: List[dict],
+    stats: dict,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    use_copy: bool = False,
+) -> None:
+    """
+    Write the new and changed statements of a batch in bulk, counting inserted,
+    updated and unchanged rows; retries row by row if the batch fails.
+    """
+    if not batch:
+        return
     try:
-        payload = json.loads(DATA_PATH.read_text(encoding="utf-8"))
+        counts = dbm.sync_financial_statements(batch, chunk_size=chunk_size, use_copy=use_copy)
     except Exception as e:
-        logger.error(f"Failed to parse JSON: {e}")
-        return
+        logger.warning(f"Bulk upsert of {len(batch)} statements failed ({e}); retrying row by row")
+        for row in batch:
+            try:
+                for k, n in dbm.sync_financial_statements([row]).items():
+                    stats[k] += n
+            except Exception as e:
+                logger.error(f"Failed to insert statement for company {row['company_id']} ({row['statement_type']}, {row['fiscal_date']}): {e}")
+                stats["failed"] += 1
+    else:
+        for k, n in counts.items():
+            stats[k] += n
+    batch.clear()
+
+def iter_company_rows(
+    dbm: DBManager,
+    rows: Iterable[Tuple[str, str, dict]],
+    stats: dict,
+    company_ids: dict,
+) -> Iterator[dict]:
+    """Upsert companies on first sight and yield their statement rows with ``company_id`` set."""
+    for company_name, ticker, row in rows:
+        if company_name not in company_ids:
+            try:
+                company = dbm.upsert_company(name=company_name, ticker=ticker, metadata={})
+                company_ids[company_name] = company.id
+                logger.info(f"Processing company: {company_name} ({ticker})")
+            except Exception as e:
+                logger.error(f"Failed to process company {company_name}: {e}")
+                company_ids[company_name] = None
+                stats["failed"] += 1
+        company_id = company_ids[company_name]
+        if company_id is None:
+            continue
+        yield dict(row, company_id=company_id)
+
+def write_rows(
+    dbm: DBManager,
+    rows: Iterable[Tuple[str, str, dict]],
+    stats: dict,
+    company_ids: dict,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    use_copy: bool = False,
+) -> None:
+    """Upsert companies on first sight and bulk upsert their statement rows in chunks."""
+    batch: List[dict] = []
+    for row in iter_company_rows(dbm, rows, stats, company_ids):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            flush_rows(dbm, batch, stats, chunk_size, use_copy)
+    flush_rows(dbm, batch, stats, chunk_size, use_copy)
 
-    inserted = 0
-    failed = 0
-    skipped = 0
+_worker_store: Optional[RawStore] = None
 
-    for company_name, company_data in payload.items():
+def normalize_landed(entry: dict) -> Tuple[List[tuple], int]:
+    """Process-pool task: read one landed file and normalize its reports -> (records, failures)."""
+    global _worker_store
+    if _worker_store is None:
+        _worker_store = RawStore(RAW_DIR)
+    stats = {"failed": 0}
+    return list(iter_normalized(iter_landed_reports(_worker_store, entry), stats)), stats["failed"]
+
+def normalize_chunk(records: List[Tuple[str, str, str, dict]]) -> Tuple[List[tuple], int]:
+    """Process-pool task: normalize a chunk of raw report records -> (records, failures)."""
+    stats = {"failed": 0}
+    return list(iter_normalized(records, stats)), stats["failed"]
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[list]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_pipeline(
+    dbm: DBManager,
+    tasks: Iterable[Tuple[Optional[str], Callable, object]],
+    stats: dict,
+    workers: int,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    use_copy: bool = False,
+    on_loaded: Optional[Callable[[str], None]] = None,
+) -> None:
+    """
+    Pipelined load for large backfills: read -> normalize (process pool) -> write.
+
+    ``tasks`` yields ``(tag, fn, arg)`` in this thread; ``fn(arg)`` runs in one
+    of ``workers`` processes and returns normalized records plus a failure
+    count; a single writer thread upserts the results in submission order,
+    in bulk batches of about ``chunk_size`` rows spanning several results.
+    At most ``2 * workers`` tasks are in flight and a few results wait
+    for the writer, so a slow database throttles reading instead of the
+    backfill piling up in memory. ``on_loaded(tag)`` runs once a tagged task
+    was normalized and written without failures.
+
+    Workers are started with the ``forkserver`` method (``spawn`` where that
+    is unavailable), never forked from this process: the writer thread may
+    hold DB driver or connection-pool locks, and forked workers would
+    inherit them and the pooled connections.
+    """
+    results: "queue.Queue" = queue.Queue(maxsize=max(2, workers))
+    write_stats = dict.fromkeys(WRITE_COUNTS + ("failed",), 0)
+
+    def writer() -> None:
+        # rows of consecutive results share one bulk upsert; a result is marked loaded only
+        # after every row of it was flushed without failures
+        company_ids, batch, pending = {}, [], []
+
+        def flush() -> None:
+            failed_before = write_stats["failed"]
+            flush_rows(dbm, batch, write_stats, chunk_size, use_copy)
+            clean = write_stats["failed"] == failed_before
+            for tag in pending:
+                if clean and on_loaded is not None:
+                    on_loaded(tag)
+            pending.clear()
+
+        while True:
+            item = results.get()
+            try:
+                if item is None:
+                    flush()
+                    return
+                tag, records, failed = item
+                failed_before = write_stats["failed"]
+                batch.extend(iter_company_rows(dbm, records, write_stats, company_ids))
+                if tag is not None and not failed and write_stats["failed"] == failed_before:
+                    pending.append(tag)
+                if len(batch) >= chunk_size:
+                    flush()
+            except Exception as e:
+                logger.error(f"Failed to write statements: {e}")
+                write_stats["failed"] += 1
+                batch.clear()
+                pending.clear()
+                if item is None:
+                    return
+
+    thread = threading.Thread(target=writer, name="load-writer", daemon=True)
+    thread.start()
+    in_flight = deque()
+
+    def hand_off() -> None:
+        tag, future = in_flight.popleft()
         try:
-            # Extract ticker from any statement
-            ticker: Optional[str] = None
-            for s in ("income_statement", "balance_sheet", "cash_flow_statement"):
-                if company_data.get(s) and company_data[s].get("symbol"):
-                    ticker = company_data[s]["symbol"]
-                    break
+            records, failed = future.result()
+        except Exception as e:
+            logger.error(f"Failed to read {tag or 'chunk'}: {e}")
+            stats["failed"] += 1
+            return
+        stats["failed"] += failed
+        results.put((tag, records, failed))  # blocks while the writer is behind
 
-            if not ticker:
-                logger.warning(f"No ticker found for {company_name}, skipping")
-                skipped += 1
-                continue
+    try:
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method)) as pool:
+            for tag, fn, arg in tasks:
+                in_flight.append((tag, pool.submit(fn, arg)))
+                if len(in_flight) >= 2 * workers:
+                    hand_off()
+            while in_flight:
+                hand_off()
+    finally:
+        results.put(None)
+        thread.join()
+        for k in WRITE_COUNTS + ("failed",):
+            stats[k] += write_stats[k]
+
+def read_load_state() -> dict:
+    if LOAD_STATE_PATH.exists():
+        return json.loads(LOAD_STATE_PATH.read_text(encoding="utf-8"))
+    return {}
+
+def write_load_state(state: dict) -> None:
+    tmp = LOAD_STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, LOAD_STATE_PATH)
+
+def load_landed(
+    dbm: DBManager,
+    stats: dict,
+    reload_all: bool = False,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    use_copy: bool = False,
+    workers: int = 1,
+) -> None:
+    """Load the landed files whose content changed since the last successful load."""
+    store = RawStore(RAW_DIR)
+    state = {} if reload_all else read_load_state()
+    changed = [(k, e) for k, e in sorted(store.manifest.items()) if state.get(k) != e["sha256"]]
+    logger.info(f"{len(changed)} of {len(store.manifest)} landed files changed since last load")
 
-            company = dbm.upsert_company(name=company_name, ticker=ticker, metadata={})
-            logger.info(f"Processing company: {company_name} ({ticker})")
-
-            # Process each statement type
-            for stype in ("income_statement", "balance_sheet", "cash_flow_statement"):
-                reports = company_data.get(stype, {}).get("annualReports", []) or []
-                
-                for rep in reports:
-                    try:
-                        fiscal = parse_date(rep.get("fiscalDateEnding") or rep.get("fiscal_date"))
-                        if not fiscal:
-                            logger.warning(f"No fiscal date for {company_name} {stype}, skipping report")
-                            continue
-
-                        # Normalize fields
-                        normalized = normalize_fields(rep, stype)
-                        
-                        dbm.insert_financial_statement(
-                            company_id=company.id,
-                            statement_type=stype,
-                            period="annual",
-                            fiscal_date=fiscal,
-                            data=rep,
-                            **normalized  # revenue, gross_profit, net_income, etc.
-                        )
-                        inserted += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to insert statement for {company_name} ({stype}, {fiscal}): {e}")
-                        failed += 1
-                        continue
+    def mark_loaded(key: str) -> None:
+        state[key] = store.manifest[key]["sha256"]
+        write_load_state(state)
 
+    if workers > 1:
+        # one task per landed file: reading and JSON decoding run in the pool too
+        tasks = ((key, normalize_landed, entry) for key, entry in changed)
+        run_pipeline(dbm, tasks, stats, workers, chunk_size, use_copy, on_loaded=mark_loaded)
+        return
+
+    company_ids = {}
+    for key, entry in changed:
+        failed_before = stats["failed"]
+        try:
+            write_rows(dbm, iter_normalized(iter_landed_reports(store, entry), stats), stats, company_ids, chunk_size, use_copy)
         except Exception as e:
-            logger.error(f"Failed to process company {company_name}: {e}")
-            failed += 1
-            continue
+            logger.error(f"Failed to read {entry['path']}: {e}")
+            stats["failed"] += 1
+        if stats["failed"] == failed_before:
+            mark_loaded(key)
+
+def load_json(
+    dbm: DBManager,
+    path: Path,
+    stats: dict,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    use_copy: bool = False,
+    workers: int = 1,
+) -> None:
+    """Load a monolithic {company: {statement: payload}} JSON file (legacy format)."""
+    try:
+        if workers > 1:
+            tasks = ((None, normalize_chunk, chunk) for chunk in iter_chunks(iter_reports(path, stats), NORMALIZE_CHUNK))
+            run_pipeline(dbm, tasks, stats, workers, chunk_size, use_copy)
+        else:
+            write_rows(dbm, iter_normalized(iter_reports(path, stats), stats), stats, {}, chunk_size, use_copy)
+    except ValueError as e:
+        logger.error(f"Failed to parse JSON: {e}")
+
+def load(
+    json_path: Optional[Path] = None,
+    reload_all: bool = False,
+    chunk_size: Optional[int] = None,
+    use_copy: bool = False,
+    workers: int = 1,
+) -> None:
+    """
+    Load financial data into the database, from the raw landing zone by default
+    or from a legacy monolithic JSON file. Reports are streamed through
+    parse -> normalize -> insert; with ``workers > 1`` normalization runs in a
+    process pool pipelined with the writes. Handles errors gracefully and logs statistics.
+    """
+    dbm = DBManager(engine)
+    ensure_tables(dbm)
+
+    chunk_size = chunk_size or (COPY_CHUNK_SIZE if use_copy else BULK_CHUNK_SIZE)
+    stats = dict.fromkeys(WRITE_COUNTS + ("failed", "skipped"), 0)
+    if json_path is None and not (RAW_DIR / "manifest.json").exists() and DATA_PATH.exists():
+        json_path = DATA_PATH
+
+    if json_path is not None:
+        if not json_path.exists():
+            logger.error(f"{json_path} not found")
+            return
+        load_json(dbm, json_path, stats, chunk_size, use_copy, workers)
+    elif (RAW_DIR / "manifest.json").exists():
+        load_landed(dbm, stats, reload_all=reload_all, chunk_size=chunk_size, use_copy=use_copy, workers=workers)
+    else:
+        logger.error(f"No landed data in {RAW_DIR} (run src/main.py first)")
+        return
+
+    inserted, updated, unchanged = (stats[k] for k in WRITE_COUNTS)
+    failed, skipped = stats["failed"], stats["skipped"]
+    logger.info(f"Load complete: {inserted} inserted, {updated} updated, {unchanged} unchanged, "
+                f"{failed} failed, {skipped} skipped")
+    print(f"Loaded {inserted + updated} financial statements into DB "
+          f"({inserted} new, {updated} updated, {unchanged} unchanged, {failed} failed, {skipped} skipped)")
 
-    logger.info(f"Load complete: {inserted} inserted, {failed} failed, {skipped} skipped")
-    print(f"Loaded {inserted} financial statements into DB ({failed} failed, {skipped} skipped)")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load extracted financial statements into the database.")
+    parser.add_argument("--json", type=Path, default=None,
+                        help="Load a legacy monolithic JSON file instead of the raw landing zone.")
+    parser.add_argument("--all", action="store_true",
+                        help="Reload every landed file, not only those changed since the last load.")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Statements per bulk upsert (default: DB_BULK_CHUNK_SIZE, or DB_COPY_CHUNK_SIZE with --copy).")
+    parser.add_argument("--copy", action="store_true",
+                        help="Use the PostgreSQL COPY fast path for large backfills (falls back to batched upserts elsewhere).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes parsing and normalizing reports while one writer upserts (1 = serial).")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    load()
\ No newline at end of file
+    args = parse_args()
+    load(json_path=args.json, reload_all=args.all, chunk_size=args.chunk_size, use_copy=args.copy, workers=args.workers)
@@ -1,7 +1,62 @@
+from rate_limiter import RateLimiter, DailyQuotaExceeded
+from response_cache import ResponseCache
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying; anything else is raised immediately
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
 class AlphaVantageClient:
-    def __init__(self, api_key):
+    def __init__(
+        self,
+        api_key,
+        rate_limiter: RateLimiter = None,
+        base_url: str = "https://www.alphavantage.co/query",
+        max_retries: int = 3,
+        backoff_factor: float = 5.0,
+        backoff_max: float = 60.0,
+        timeout: float = 30.0,
+        pool_maxsize: int = 10,
+        cache: ResponseCache = None,
+    ):
         self.api_key = api_key
-        self.base_url = "https://www.alphavantage.co/query"
+        self.base_url = base_url
+        # every request goes through one scheduler so per-minute/per-day quotas hold
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.cache = cache
+        self._session = None
+        self._lock = threading.Lock()
+        self.latencies = []  # seconds per HTTP call, successful or not
+
+    @property
+    def session(self):
+        """Keep-alive session shared by all calls (and threads) of this client."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            with self._lock:
+                if self._session is None:
+                    s = requests.Session()
+                    # retries are handled in _make_request so each attempt is rate limited
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+                    s.mount("https://", adapter)
+                    s.mount("http://", adapter)
+                    self._session = s
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def fetch_financial_statements(self, symbol, statement_type, years=3):
         params = {
@@ -10,23 +65,145 @@ class AlphaVantageClient:
             "apikey": self.api_key,
             "datatype": "json"
         }
-        response = self._make_request(params)
-        return self._process_response(response, years)
+        if self.cache is None:
+            response = self._make_request(params)
+            return self._process_response(response, years)
+
+        # fresh cache entries cost no API call; stale ones are revalidated
+        entry = self.cache.lookup(statement_type, symbol)
+        cached = self._load_cached(entry)
+        if cached is not None and self.cache.is_fresh(entry):
+            self.cache.record_hit()
+            return self._process_response(cached, years)
+
+        # only ask for a 304 when there is a cached body to fall back on
+        headers = self.cache.validators(entry) if cached is not None else None
+        http_response, payload = self._send(params, headers=headers)
+        if http_response.status_code == 304:
+            if cached is not None:
+                self.cache.touch(statement_type, symbol)
+                return self._process_response(cached, years)
+            http_response, payload = self._send(params)
+        payload = self._process_response(payload, years)
+        self.cache.store(
+            statement_type,
+            symbol,
+            payload,
+            etag=http_response.headers.get("ETag"),
+            last_modified=http_response.headers.get("Last-Modified"),
+        )
+        return payload
+
+    def _load_cached(self, entry):
+        """Cached payload for ``entry``, or None when there is none or its body is unreadable."""
+        if not entry:
+            return None
+        try:
+            return self.cache.load(entry)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {entry.get('hash')}: {e}")
+            return None
+
+    def _backoff(self, attempt):
+        return min(self.backoff_max, self.backoff_factor * (2 ** attempt))
 
     def _make_request(self, params):
+        return self._send(params)[1]
+
+    def _send(self, params, headers=None):
+        """
+        GET with rate limiting, retries and throttle detection.
+
+        Returns:
+            (response, decoded JSON payload); the payload is None for 304 Not Modified
+        """
         import requests
-        response = requests.get(self.base_url, params=params)
-        response.raise_for_status()
-        return response.json()
+        label = f"{params.get('function')} {params.get('symbol')}"
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(self.base_url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record_latency(label, start, "error")
+                if attempt == self.max_retries:
+                    raise
+                reason = str(e)
+            else:
+                self._record_latency(label, start, response.status_code)
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                    reason = f"HTTP {response.status_code}"
+                else:
+                    if response.status_code == 304:
+                        return response, None
+                    response.raise_for_status()
+                    payload = response.json()
+                    throttle = self._throttle_message(payload)
+                    if throttle is None:
+                        return response, payload
+                    if "per day" in throttle.lower():
+                        raise DailyQuotaExceeded(f"Alpha Vantage daily limit reached: {throttle}")
+                    if "premium" in throttle.lower():
+                        raise ValueError(f"Alpha Vantage rejected {label}: {throttle}")
+                    if attempt == self.max_retries:
+                        raise ValueError(f"Alpha Vantage throttled {label}: {throttle}")
+                    reason = throttle
+            delay = self._backoff(attempt)
+            logger.warning(f"{label} attempt {attempt + 1} failed ({reason}); retrying in {delay:.0f}s")
+            time.sleep(delay)
+
+    @staticmethod
+    def _throttle_message(payload):
+        """Return the throttle notice of a 200 response that carries no data, else None."""
+        if not isinstance(payload, dict):
+            return None
+        for key in ("Note", "Information"):
+            message = payload.get(key)
+            if message and len(payload) == 1:
+                return str(message)
+        return None
+
+    def _record_latency(self, label, start, status):
+        elapsed = time.perf_counter() - start
+        self.latencies.append(elapsed)
+        logger.debug(f"GET {label} -> {status} in {elapsed * 1000:.0f} ms")
+
+    def latency_summary(self) -> dict:
+        """Count, mean, p50, p95 and max of per-call latency in milliseconds."""
+        lat = sorted(self.latencies)
+        if not lat:
+            return {"calls": 0}
+
+        def pick(q):
+            return lat[min(len(lat) - 1, int(q * len(lat)))] * 1000
+
+        return {
+            "calls": len(lat),
+            "mean_ms": sum(lat) / len(lat) * 1000,
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "max_ms": lat[-1] * 1000,
+        }
 
     def _process_response(self, response, years):
         if "Error Message" in response:
             raise ValueError("Error fetching data from Alpha Vantage: " + response["Error Message"])
-        
+
         # Process the response to extract the last 'years' of data
         # This is a placeholder for actual processing logic
         return response
 
+    def calls_needed(self, symbol, functions):
+        """Number of API calls fetching ``functions`` for ``symbol`` would spend (fresh cache hits are free)."""
+        if self.cache is None:
+            return len(functions)
+        needed = 0
+        for function in functions:
+            entry = self.cache.lookup(function, symbol)
+            if not (entry and self.cache.is_fresh(entry)):
+                needed += 1
+        return needed
+
     def get_income_statement(self, symbol):
         return self.fetch_financial_statements(symbol, "INCOME_STATEMENT")
 
@@ -34,4 +211,4 @@ class AlphaVantageClient:
         return self.fetch_financial_statements(symbol, "BALANCE_SHEET")
 
     def get_cash_flow_statement(self, symbol):
-        return self.fetch_financial_statements(symbol, "CASH_FLOW")
\ No newline at end of file
+        return self.fetch_financial_statements(symbol, "CASH_FLOW")
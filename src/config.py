@@ -1,9 +1,24 @@
 import os
+import csv
+import json
 from dotenv import load_dotenv
 from pathlib import Path
 
 load_dotenv()
 
+
+def load_companies(path: str) -> dict:
+    """Read a {name: ticker} universe from a JSON object or a `name,ticker` CSV file."""
+    p = Path(path)
+    if p.suffix.lower() == ".json":
+        return dict(json.loads(p.read_text(encoding="utf-8")))
+    with open(p, newline="", encoding="utf-8") as f:
+        rows = [r for r in csv.reader(f) if r and not r[0].startswith("#")]
+    if rows and [c.strip().lower() for c in rows[0][:2]] == ["name", "ticker"]:
+        rows = rows[1:]
+    return {r[0].strip(): r[1].strip() for r in rows}
+
+
 class Config:
     DEV_MODE = os.getenv("DEV_MODE", "true").lower()
     ALPHA_VANTAGE_API_KEY = os.getenv("API_KEY")
@@ -13,10 +28,27 @@ class Config:
         "Sensata Technologies": "ST",
         "DuPont de Nemours": "DD"
     }
+    # Optional larger universe: JSON {name: ticker} or CSV name,ticker
+    COMPANIES_FILE = os.getenv("COMPANIES_FILE")
+    if COMPANIES_FILE:
+        COMPANIES = load_companies(COMPANIES_FILE)
     FINANCIAL_STATEMENTS = ["INCOME_STATEMENT", "BALANCE_SHEET", "CASH_FLOW"]
     DATA_PERIOD = "annual"
-    REQUEST_LIMIT = 25
-    CALLS_PER_MINUTE = 5
+    REQUEST_LIMIT = int(os.getenv("REQUEST_LIMIT", "25"))
+    CALLS_PER_MINUTE = int(os.getenv("CALLS_PER_MINUTE", "5"))
+    RATE_LIMIT_STATE = os.getenv("RATE_LIMIT_STATE", "data/rate_limit_state.json")
+    # HTTP retry policy for Alpha Vantage calls (HTTP errors and "Note"/"Information" throttle bodies)
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "5"))
+    HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "60"))
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+    # Response cache: statements are served from disk until they are CACHE_TTL_DAYS old
+    CACHE_DIR = os.getenv("CACHE_DIR", "data/cache")
+    CACHE_TTL_DAYS = float(os.getenv("CACHE_TTL_DAYS", "30"))
+    REFRESH_QUEUE_STATE = os.getenv("REFRESH_QUEUE_STATE", "data/refresh_queue.json")
+    # Raw landing zone: one NDJSON file per ticker and statement
+    RAW_DIR = os.getenv("RAW_DIR", "data/raw")
+    RAW_COMPRESS = os.getenv("RAW_COMPRESS", "false").lower() in ("1", "true", "yes")
 
     def init_config(self):
         if not self.ALPHA_VANTAGE_API_KEY:
@@ -36,4 +68,14 @@ COMPANIES = Config.COMPANIES
 FINANCIAL_STATEMENTS = Config.FINANCIAL_STATEMENTS
 REQUEST_LIMIT = Config.REQUEST_LIMIT
 CALLS_PER_MINUTE = Config.CALLS_PER_MINUTE
+RATE_LIMIT_STATE = Config.RATE_LIMIT_STATE
+HTTP_MAX_RETRIES = Config.HTTP_MAX_RETRIES
+HTTP_BACKOFF_FACTOR = Config.HTTP_BACKOFF_FACTOR
+HTTP_BACKOFF_MAX = Config.HTTP_BACKOFF_MAX
+HTTP_TIMEOUT = Config.HTTP_TIMEOUT
+CACHE_DIR = Config.CACHE_DIR
+CACHE_TTL_DAYS = Config.CACHE_TTL_DAYS
+REFRESH_QUEUE_STATE = Config.REFRESH_QUEUE_STATE
+RAW_DIR = Config.RAW_DIR
+RAW_COMPRESS = Config.RAW_COMPRESS
 DEV_MODE = Config.DEV_MODE
\ No newline at end of file
@@ -1,27 +1,171 @@
 from contextlib import contextmanager
-from typing import Iterable, Optional, List
-from datetime import date
+from typing import Iterable, Iterator, Optional, List, Sequence
+from datetime import date, datetime, timezone
+import csv
+import hashlib
+import io
+import json
 import logging
+import os
+import threading
+import zlib
 
+from sqlalchemy import (
+    Boolean, Date, DateTime, Float, Integer, String, and_, bindparam, case, delete, extract, func, insert, inspect, or_,
+    select, text, tuple_,
+)
 from sqlalchemy.orm import Session
 
-from src.db import engine, Base, get_session
-from src.models import Company, FinancialStatement, Metric
+from src.db import Base, get_engine, get_read_engine, make_sessionmaker
+from src.models import (
+    Company, FinancialFact, FinancialStatement, Metric, MetricSummary, PipelineState, RawPayload, FACT_COLUMN_SOURCES,
+)
 
 logger = logging.getLogger(__name__)
 
+# rows per INSERT ... ON CONFLICT statement in the bulk upsert APIs
+BULK_CHUNK_SIZE = int(os.getenv("DB_BULK_CHUNK_SIZE", "500"))
+
+STATEMENT_KEY = ("company_id", "statement_type", "fiscal_date")  # u_company_statement_fiscal
+# stored statement values; their digest is kept in financial_statements.fingerprint
+FINGERPRINT_COLUMNS = (
+    "period", "payload_hash", "revenue", "gross_profit", "net_income",
+    "total_assets", "total_liabilities", "operating_cashflow", "currency",
+)
+STATEMENT_VALUE_COLUMNS = FINGERPRINT_COLUMNS + ("fingerprint",)
+METRIC_KEY = ("company_id", "year", "metric_name")  # u_company_year_metric
+FACT_KEY = ("company_id", "fiscal_date")  # u_company_fact_fiscal
+FACT_STATEMENT_TYPES = ("income_statement", "balance_sheet", "cash_flow_statement")
+FACT_VALUE_COLUMNS = tuple(FACT_COLUMN_SOURCES) + tuple(f"has_{t}" for t in FACT_STATEMENT_TYPES)
+SUMMARY_KEY = ("metric_name", "company_id")  # u_metric_company_summary
+SUMMARY_VALUE_COLUMNS = (
+    "first_year", "latest_year", "first_value", "latest_value", "min_value", "max_value", "cagr", "years",
+)
+
+# rows per COPY batch in the Postgres fast path
+COPY_CHUNK_SIZE = int(os.getenv("DB_COPY_CHUNK_SIZE", "50000"))
+
+# rows fetched per round trip / Arrow record batch by the columnar read path
+READ_CHUNK_SIZE = int(os.getenv("DB_READ_CHUNK_SIZE", "50000"))
+
+# zlib level for raw_payloads bodies; 0 stores the canonical JSON uncompressed
+PAYLOAD_COMPRESS_LEVEL = int(os.getenv("DB_PAYLOAD_COMPRESS_LEVEL", "6"))
+_COPY_NULL = "\\N"
+
 class DBManager:
-    def __init__(self, engine_ = None):
-        self.engine = engine_ or engine
+    def __init__(self, engine_ = None, read_engine = None):
+        self.engine = engine_ or get_engine()
+        # read-only queries go to the DATABASE_READ_URL replica unless an explicit engine is given
+        self.read_engine = read_engine or (get_read_engine() if engine_ is None else self.engine)
+        self._sessionmaker = make_sessionmaker(self.engine)
+        self._read_sessionmaker = (
+            self._sessionmaker if self.read_engine is self.engine else make_sessionmaker(self.read_engine)
+        )
+        self._local = threading.local()  # per-thread unit-of-work session
 
     def create_tables(self) -> None:
-        """Create all tables defined in Base metadata."""
+        """Create all tables defined in Base metadata and add columns missing from older tables."""
+        inspector = inspect(self.engine)
+        had_facts = inspector.has_table(FinancialFact.__tablename__)
+        had_summaries = inspector.has_table(MetricSummary.__tablename__)
+        had_fingerprints = not inspector.has_table(FinancialStatement.__tablename__) or "fingerprint" in {
+            c["name"] for c in inspector.get_columns(FinancialStatement.__tablename__)
+        }
         Base.metadata.create_all(bind=self.engine)
+        self._add_missing_columns()
+        self._migrate_payloads()
+        if not had_fingerprints:
+            logger.info(f"Fingerprinted {self._backfill_fingerprints()} existing statements")
+        # databases populated before these derived tables existed
+        if not had_facts:
+            logger.info(f"Built {self.rebuild_financial_facts()} financial facts from existing statements")
+        if not had_summaries:
+            logger.info(f"Built {self.rebuild_metric_summaries()} metric summaries from existing metrics")
+
+    def _add_missing_columns(self) -> None:
+        """
+        Add nullable model columns (and their indexes) that an existing table
+        predates; create_all only creates whole tables.
+        """
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    continue
+                existing = {c["name"] for c in inspector.get_columns(table.name)}
+                added = [c for c in table.columns if c.name not in existing]
+                for col in added:
+                    if not col.nullable:
+                        logger.warning(f"Cannot add NOT NULL column {table.name}.{col.name}; recreate the table")
+                        continue
+                    col_type = col.type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}"))
+                    logger.info(f"Added column {table.name}.{col.name}")
+                for idx in table.indexes:
+                    if any(c in added for c in idx.columns):
+                        idx.create(bind=conn, checkfirst=True)
+
+    def _migrate_payloads(self) -> None:
+        """
+        Move the inline ``data`` column of a financial_statements table that
+        predates raw_payloads into the side table, then drop the column.
+        """
+        columns = {c["name"] for c in inspect(self.engine).get_columns(FinancialStatement.__tablename__)}
+        if "data" not in columns:
+            return
+        t = FinancialStatement.__table__
+        link = t.update().where(t.c.id == bindparam("_id")).values(payload_hash=bindparam("_hash"))
+        batch_sql = text("SELECT id, data FROM financial_statements WHERE id > :last ORDER BY id LIMIT :n")
+        moved, last = 0, 0
+        with self.session() as s:
+            while True:
+                batch = s.execute(batch_sql, {"last": last, "n": BULK_CHUNK_SIZE}).all()
+                if not batch:
+                    break
+                last = batch[-1][0]
+                rows = [
+                    {"id": id_, "data": json.loads(data) if isinstance(data, str) else data}
+                    for id_, data in batch if data is not None
+                ]
+                rows, payloads = self._split_payloads(rows)
+                self._store_payloads(s, payloads)
+                if rows:
+                    s.execute(link, [{"_id": r["id"], "_hash": r["payload_hash"]} for r in rows])
+                moved += len(rows)
+            s.execute(text("ALTER TABLE financial_statements DROP COLUMN data"))
+        logger.info(f"Moved {moved} raw statement payloads to raw_payloads")
+
+    def _backfill_fingerprints(self) -> int:
+        """Fill financial_statements.fingerprint for rows written before the column existed."""
+        t = FinancialStatement.__table__
+        link = t.update().where(t.c.id == bindparam("_id")).values(fingerprint=bindparam("_fp"))
+        filled, last = 0, 0
+        with self.session() as s:
+            while True:
+                batch = s.execute(
+                    select(t.c.id, *[t.c[c] for c in FINGERPRINT_COLUMNS])
+                    .where(t.c.id > last).order_by(t.c.id).limit(BULK_CHUNK_SIZE)
+                ).mappings().all()
+                if not batch:
+                    break
+                last = batch[-1]["id"]
+                s.execute(link, [{"_id": r["id"], "_fp": self.statement_fingerprint(r)} for r in batch])
+                filled += len(batch)
+        return filled
 
     @contextmanager
     def session(self) -> Iterable[Session]:
-        """Context manager for database sessions with automatic commit/rollback."""
-        s = get_session()
+        """
+        Context manager for database sessions with automatic commit/rollback.
+        Inside unit_of_work() the unit's session is yielded instead, and the
+        unit commits or rolls back.
+        """
+        active = getattr(self._local, "session", None)
+        if active is not None:
+            yield active
+            active.flush()  # later calls in the unit see this call's writes, as after a commit
+            return
+        s = self._sessionmaker()
         try:
             yield s
             s.commit()
@@ -32,6 +176,56 @@ class DBManager:
         finally:
             s.close()
 
+    @contextmanager
+    def read_session(self) -> Iterable[Session]:
+        """
+        Session on the read engine (the replica, if configured) for queries
+        that write nothing; it is closed without committing. Inside
+        unit_of_work() the unit's session is yielded, so the unit reads its
+        own writes.
+        """
+        active = getattr(self._local, "session", None)
+        if active is not None:
+            yield active
+            return
+        s = self._read_sessionmaker()
+        try:
+            yield s
+        finally:
+            s.close()  # ends the transaction; unlike rollback() it leaves loaded objects usable
+
+    @contextmanager
+    def unit_of_work(self) -> Iterable[Session]:
+        """
+        Run the session-based DBManager calls made by this thread inside the
+        block in one session and transaction: one connection checkout and one
+        commit instead of one per call. An exception rolls back the whole
+        unit. Nested units join the outermost one. The streamed Arrow reads
+        use their own connection and do not see the unit's uncommitted writes.
+
+            with dbm.unit_of_work():
+                company = dbm.upsert_company(name, ticker)
+                dbm.insert_financial_statement(company.id, ...)
+        """
+        if getattr(self._local, "session", None) is not None:
+            yield self._local.session
+            return
+        with self.session() as s:
+            self._local.session = s
+            try:
+                yield s
+            finally:
+                self._local.session = None
+
+    @contextmanager
+    def _session_or(self, s: Optional[Session]) -> Iterable[Session]:
+        """Yield ``s`` when given (the caller owns the transaction), else a new managed session."""
+        if s is not None:
+            yield s
+        else:
+            with self.session() as new:
+                yield new
+
     # Companies
     def upsert_company(self, name: str, ticker: str, metadata: Optional[dict] = None) -> Company:
         """Insert or update company by name or ticker."""
@@ -49,9 +243,661 @@ class DBManager:
 
     def get_companies(self) -> List[Company]:
         """Retrieve all companies."""
-        with self.session() as s:
+        with self.read_session() as s:
             return s.query(Company).all()
 
+    # Bulk upserts
+    def _upsert_insert(self, table):
+        """Dialect-native INSERT construct supporting ON CONFLICT, or None if unsupported."""
+        name = self.engine.dialect.name
+        if name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            return None
+        return insert(table)
+
+    def _bulk_upsert(
+        self,
+        table,
+        rows: Sequence[dict],
+        key: Sequence[str],
+        value_columns: Sequence[str],
+        chunk_size: Optional[int],
+        touch_column: Optional[str] = None,
+        session: Optional[Session] = None,
+        skip_unchanged: bool = False,
+    ) -> int:
+        """
+        Upsert ``rows`` with INSERT ... ON CONFLICT (key) DO UPDATE in chunks; returns rows written.
+
+        With ``skip_unchanged`` (implied by ``touch_column``), existing rows are
+        only updated when one of ``value_columns`` differs and the count only
+        includes rows actually inserted or updated. With ``touch_column`` set,
+        that column records when they were. Runs in ``session`` if given, else
+        in its own transaction.
+        """
+        chunk_size = chunk_size or BULK_CHUNK_SIZE
+        written = 0
+        with self._session_or(session) as s:
+            for start in range(0, len(rows), chunk_size):
+                # the same key twice in one statement is an error on Postgres; last one wins
+                chunk = list({tuple(r[k] for k in key): r for r in rows[start:start + chunk_size]}.values())
+                stmt = self._upsert_insert(table).values(chunk)
+                set_ = {c: stmt.excluded[c] for c in value_columns}
+                where = None
+                if touch_column:
+                    set_[touch_column] = stmt.excluded[touch_column]
+                if touch_column or skip_unchanged:
+                    where = or_(*[table.c[c].is_distinct_from(stmt.excluded[c]) for c in value_columns])
+                stmt = stmt.on_conflict_do_update(index_elements=list(key), set_=set_, where=where)
+                result = s.execute(stmt)
+                written += len(chunk) if where is None else result.rowcount
+        return written
+
+    # Raw payloads
+    @staticmethod
+    def hash_payload(report: dict):
+        """
+        ``(hash, raw)`` of a report: its canonical JSON (sorted keys, no
+        whitespace) and the SHA-256 of it, the report's raw_payloads key.
+        """
+        raw = json.dumps(report, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest(), raw
+
+    @staticmethod
+    def encode_payload(raw: bytes):
+        """``(encoding, body)`` stored for canonical JSON: zlib-compressed when that is smaller."""
+        if PAYLOAD_COMPRESS_LEVEL:
+            packed = zlib.compress(raw, PAYLOAD_COMPRESS_LEVEL)
+            if len(packed) < len(raw):
+                return "zlib", packed
+        return "json", raw
+
+    @staticmethod
+    def decode_payload(encoding: str, body: bytes) -> dict:
+        """Inverse of encode_payload for a stored (encoding, body) pair."""
+        return json.loads(zlib.decompress(body) if encoding == "zlib" else body)
+
+    @classmethod
+    def _split_payloads(cls, rows: Iterable[dict]):
+        """
+        Statement rows with their ``data`` report replaced by ``payload_hash``,
+        and the canonical JSON of those reports by hash. Rows that already carry
+        ``payload_hash`` are taken as is; their payload must be stored already.
+        """
+        out, payloads = [], {}
+        for r in rows:
+            r = dict(r)
+            data = r.pop("data", None)
+            if data is not None and "payload_hash" not in r:
+                h, raw = cls.hash_payload(data)
+                payloads[h] = raw
+                r["payload_hash"] = h
+            out.append(r)
+        return out, payloads
+
+    def _store_payloads(self, s: Session, payloads: dict) -> int:
+        """Insert the payloads (canonical JSON by hash) not stored yet; returns rows written."""
+        hashes = list(payloads)
+        known = set()
+        for start in range(0, len(hashes), BULK_CHUNK_SIZE):
+            batch = hashes[start:start + BULK_CHUNK_SIZE]
+            known.update(s.scalars(select(RawPayload.hash).where(RawPayload.hash.in_(batch))))
+        missing = []
+        for h in hashes:
+            if h not in known:
+                encoding, body = self.encode_payload(payloads[h])
+                missing.append({"hash": h, "encoding": encoding, "body": body, "size": len(payloads[h])})
+        for start in range(0, len(missing), BULK_CHUNK_SIZE):
+            chunk = missing[start:start + BULK_CHUNK_SIZE]
+            stmt = self._upsert_insert(RawPayload.__table__)
+            if stmt is None:
+                s.execute(insert(RawPayload.__table__), chunk)
+            else:
+                # a concurrent loader may have stored the same report meanwhile
+                s.execute(stmt.values(chunk).on_conflict_do_nothing(index_elements=["hash"]))
+        return len(missing)
+
+    def get_payloads(self, hashes: Iterable[Optional[str]]) -> dict:
+        """Raw reports by payload hash (see FinancialStatement.payload_hash); unknown hashes are left out."""
+        hashes = list({h for h in hashes if h})
+        payloads = {}
+        with self.read_session() as s:
+            for start in range(0, len(hashes), BULK_CHUNK_SIZE):
+                stmt = select(RawPayload.hash, RawPayload.encoding, RawPayload.body).where(
+                    RawPayload.hash.in_(hashes[start:start + BULK_CHUNK_SIZE])
+                )
+                for h, encoding, body in s.execute(stmt):
+                    payloads[h] = self.decode_payload(encoding, body)
+        return payloads
+
+    def prune_payloads(self) -> int:
+        """Delete raw payloads no statement references any more (superseded or deleted reports)."""
+        with self.session() as s:
+            referenced = select(FinancialStatement.id).where(FinancialStatement.payload_hash == RawPayload.hash)
+            return s.execute(delete(RawPayload).where(~referenced.exists())).rowcount
+
+    # Financial statements
+    @staticmethod
+    def statement_fingerprint(row: dict) -> str:
+        """Digest of a statement row's stored values (FINGERPRINT_COLUMNS); equal digests need no write."""
+        values = [row.get(c) for c in FINGERPRINT_COLUMNS]
+        return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _stored_fingerprints(self, s: Session, company_ids: Iterable[int]) -> dict:
+        """Fingerprints of the stored statements of ``company_ids`` by (company_id, statement_type, fiscal_date)."""
+        fs = FinancialStatement
+        company_ids = list(company_ids)
+        stored = {}
+        for start in range(0, len(company_ids), BULK_CHUNK_SIZE):
+            stmt = select(fs.company_id, fs.statement_type, fs.fiscal_date, fs.fingerprint).where(
+                fs.company_id.in_(company_ids[start:start + BULK_CHUNK_SIZE])
+            )
+            for company_id, statement_type, fiscal_date, fingerprint in s.execute(stmt):
+                stored[(company_id, statement_type, fiscal_date)] = fingerprint
+        return stored
+
+    def sync_financial_statements(
+        self, rows: Iterable[dict], chunk_size: Optional[int] = None, use_copy: bool = False,
+    ) -> dict:
+        """
+        Write only the statements that are new or changed. Rows (as for
+        bulk_upsert_financial_statements) are fingerprinted and compared with
+        the stored fingerprints of their companies in one query per batch of
+        companies, so re-loading unchanged reports costs reads but no writes
+        (nor a data version bump).
+        Changed rows go through copy_upsert_financial_statements with
+        ``use_copy``, else bulk_upsert_financial_statements.
+        Returns ``{"inserted": n, "updated": n, "unchanged": n}``.
+        """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        # last one wins for a repeated key, as in the upserts
+        rows = list({tuple(r.get(k) for k in STATEMENT_KEY): dict(r) for r in rows}.values())
+        if not rows:
+            return counts
+        payloads = {}
+        for r in rows:
+            if r.get("data") is not None:
+                # data stays on the row for backends without ON CONFLICT (insert_financial_statement)
+                h, raw = self.hash_payload(r["data"])
+                payloads[h] = raw
+                r["payload_hash"] = h
+        with self.unit_of_work():
+            with self.session() as s:
+                stored = self._stored_fingerprints(s, {r["company_id"] for r in rows})
+                changed = []
+                for r in rows:
+                    key = tuple(r[k] for k in STATEMENT_KEY)
+                    if key not in stored:
+                        counts["inserted"] += 1
+                    elif stored[key] != self.statement_fingerprint(r):
+                        counts["updated"] += 1
+                    else:
+                        counts["unchanged"] += 1
+                        continue
+                    changed.append(r)
+                if changed:
+                    self._store_payloads(s, {r["payload_hash"]: payloads[r["payload_hash"]]
+                                             for r in changed if r.get("payload_hash") in payloads})
+            if changed:
+                upsert = self.copy_upsert_financial_statements if use_copy else self.bulk_upsert_financial_statements
+                upsert(changed, chunk_size=chunk_size)
+        return counts
+
+    def bulk_upsert_financial_statements(self, rows: Iterable[dict], chunk_size: Optional[int] = None) -> int:
+        """
+        Insert or update many financial statements in a few round trips.
+
+        Each row holds ``company_id``, ``statement_type``, ``period``, ``fiscal_date``,
+        ``data`` and any of the normalized columns; missing ones are stored as NULL.
+        ``data`` goes to raw_payloads, written only for reports not stored yet.
+        Conflicts on u_company_statement_fiscal update the existing row when
+        its values changed, bumping ``updated_at``. The matching financial_facts
+        rows are refreshed and the data version is bumped in the same transaction.
+        Returns the number of rows written.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        if self._upsert_insert(FinancialStatement.__table__) is None:
+            args = STATEMENT_KEY + ("data",) + tuple(c for c in FINGERPRINT_COLUMNS if c != "payload_hash")
+            for r in rows:
+                self.insert_financial_statement(**{c: r.get(c) for c in args})
+            return len(rows)
+        rows, payloads = self._split_payloads(rows)
+        rows = [
+            {c: r.get(c) for c in STATEMENT_KEY + STATEMENT_VALUE_COLUMNS}
+            for r in rows
+        ]
+        now = datetime.now(timezone.utc)
+        for r in rows:
+            r["fingerprint"] = self.statement_fingerprint(r)
+            r["updated_at"] = now
+        with self.session() as s:
+            self._store_payloads(s, payloads)
+            written = self._bulk_upsert(
+                FinancialStatement.__table__, rows, STATEMENT_KEY, STATEMENT_VALUE_COLUMNS, chunk_size,
+                touch_column="updated_at", session=s,
+            )
+            self._refresh_facts(s, self._fact_keys(rows))
+            self._bump_version(s)  # dashboards serve facts: drop their cached queries on commit
+        return written
+
+    def copy_upsert_financial_statements(self, rows: Iterable[dict], chunk_size: Optional[int] = None) -> int:
+        """
+        High-volume variant of bulk_upsert_financial_statements for backfills.
+
+        On PostgreSQL (psycopg2) rows are streamed with COPY FROM STDIN into a
+        temporary staging table and merged into financial_statements with one
+        INSERT ... SELECT ... ON CONFLICT DO UPDATE per batch. Other backends
+        (e.g. the SQLite dev.db) fall back to the batched upsert path.
+        Returns the number of rows written.
+        """
+        if self.engine.dialect.name != "postgresql" or self.engine.dialect.driver != "psycopg2":
+            return self.bulk_upsert_financial_statements(rows, chunk_size=chunk_size)
+
+        chunk_size = chunk_size or COPY_CHUNK_SIZE
+        columns = STATEMENT_KEY + STATEMENT_VALUE_COLUMNS
+        col_list = ", ".join(columns)
+        merge_sql = (
+            f"INSERT INTO financial_statements ({col_list}, updated_at) "
+            f"SELECT DISTINCT ON (company_id, statement_type, fiscal_date) {col_list}, %(now)s "
+            f"FROM fs_staging ORDER BY company_id, statement_type, fiscal_date, seq DESC "
+            f"ON CONFLICT ({', '.join(STATEMENT_KEY)}) DO UPDATE SET "
+            + ", ".join(f"{c} = EXCLUDED.{c}" for c in STATEMENT_VALUE_COLUMNS + ("updated_at",))
+            + f" WHERE ({', '.join(f'financial_statements.{c}' for c in STATEMENT_VALUE_COLUMNS)}) "
+            f"IS DISTINCT FROM ({', '.join(f'EXCLUDED.{c}' for c in STATEMENT_VALUE_COLUMNS)})"
+        )
+        now = datetime.now(timezone.utc)
+
+        def copy_chunk(s: Session, cur, chunk: List[dict]) -> None:
+            chunk, payloads = self._split_payloads(chunk)
+            self._store_payloads(s, payloads)
+            for r in chunk:
+                r["fingerprint"] = self.statement_fingerprint(r)
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for seq, r in enumerate(chunk):
+                writer.writerow([seq] + [self._copy_value(c, r.get(c)) for c in columns])
+            buf.seek(0)
+            cur.execute("TRUNCATE fs_staging")
+            cur.copy_expert(
+                f"COPY fs_staging (seq, {col_list}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')", buf
+            )
+            cur.execute(merge_sql, {"now": now})
+
+        written = 0
+        fact_keys = set()
+        with self.session() as s:
+            cur = s.connection().connection.cursor()
+            try:
+                cur.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS fs_staging ("
+                    "seq integer, company_id integer, statement_type varchar(64), period varchar(32), "
+                    "fiscal_date date, payload_hash varchar(64), revenue double precision, gross_profit double precision, "
+                    "net_income double precision, total_assets double precision, total_liabilities double precision, "
+                    "operating_cashflow double precision, currency varchar(8), fingerprint varchar(32)"
+                    ") ON COMMIT DROP"
+                )
+                chunk: List[dict] = []
+                for r in rows:
+                    chunk.append(r)
+                    fact_keys.update(self._fact_keys([r]))
+                    if len(chunk) >= chunk_size:
+                        copy_chunk(s, cur, chunk)
+                        written += len(chunk)
+                        chunk = []
+                if chunk:
+                    copy_chunk(s, cur, chunk)
+                    written += len(chunk)
+            finally:
+                cur.close()
+            self._refresh_facts(s, fact_keys)
+            if written:
+                self._bump_version(s)
+        return written
+
+    @staticmethod
+    def _copy_value(column: str, value):
+        if value is None:
+            return _COPY_NULL
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+    # Columnar reads
+    @staticmethod
+    def _arrow_type(sa_type):
+        """Arrow type for a SQLAlchemy column type, or None to serialize values as JSON text."""
+        import pyarrow as pa
+
+        if isinstance(sa_type, Boolean):
+            return pa.bool_()
+        if isinstance(sa_type, Integer):
+            return pa.int64()
+        if isinstance(sa_type, Float):
+            return pa.float64()
+        if isinstance(sa_type, String):
+            return pa.string()
+        if isinstance(sa_type, DateTime):
+            return pa.timestamp("us", tz="UTC") if sa_type.timezone else pa.timestamp("us")
+        if isinstance(sa_type, Date):
+            return pa.date32()
+        return None
+
+    def iter_arrow_batches(self, stmt, chunk_size: Optional[int] = None) -> Iterator:
+        """
+        Stream a Core ``select()`` as pyarrow RecordBatches of up to
+        ``chunk_size`` rows, without ORM hydration or identity map. Rows are
+        fetched in chunks (server-side cursor on PostgreSQL), so memory is
+        bounded by one batch plus its Arrow copy. Runs on the read engine.
+        Columns of unmapped types (e.g. JSON) come back as JSON text.
+        """
+        import pyarrow as pa
+
+        chunk_size = chunk_size or READ_CHUNK_SIZE
+        types = [self._arrow_type(c.type) for c in stmt.selected_columns]
+        schema = pa.schema([
+            pa.field(c.key, t if t is not None else pa.string()) for c, t in zip(stmt.selected_columns, types)
+        ])
+        with self.read_engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(stmt)
+            for rows in result.partitions(chunk_size):
+                columns = list(zip(*rows))
+                arrays = []
+                for values, t in zip(columns, types):
+                    if t is None:
+                        values = [None if v is None else json.dumps(v, ensure_ascii=False) for v in values]
+                    arrays.append(pa.array(values, type=t if t is not None else pa.string()))
+                yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def read_arrow(self, stmt, chunk_size: Optional[int] = None):
+        """Run a Core ``select()`` into one pyarrow Table (see iter_arrow_batches)."""
+        import pyarrow as pa
+
+        batches = list(self.iter_arrow_batches(stmt, chunk_size))
+        if batches:
+            return pa.Table.from_batches(batches)
+        schema = pa.schema([
+            pa.field(c.key, self._arrow_type(c.type) or pa.string()) for c in stmt.selected_columns
+        ])
+        return schema.empty_table()
+
+    def read_frame(self, stmt, chunk_size: Optional[int] = None):
+        """Run a Core ``select()`` into a pandas DataFrame through Arrow."""
+        return self.read_arrow(stmt, chunk_size).to_pandas(date_as_object=True)
+
+    def read_companies(self, as_frame: bool = False):
+        """All companies (id, name, ticker, created_at) as a pyarrow Table or pandas DataFrame."""
+        stmt = select(Company.id, Company.name, Company.ticker, Company.created_at).order_by(Company.id)
+        return self.read_frame(stmt) if as_frame else self.read_arrow(stmt)
+
+    def read_metrics(self, company_id: Optional[int] = None, as_frame: bool = False):
+        """Metrics (company_id, year, metric_name, value) as a pyarrow Table or pandas DataFrame."""
+        m = Metric
+        stmt = select(m.company_id, m.year, m.metric_name, m.value)
+        if company_id is not None:
+            stmt = stmt.where(m.company_id == company_id)
+        stmt = stmt.order_by(m.company_id, m.year)
+        return self.read_frame(stmt) if as_frame else self.read_arrow(stmt)
+
+    def read_financials(
+        self,
+        company_id: Optional[int] = None,
+        statement_type: Optional[str] = None,
+        period: Optional[str] = None,
+        include_data: bool = False,
+        as_frame: bool = False,
+    ):
+        """
+        Financial statements with the same filters as fetch_financials, as a
+        pyarrow Table or pandas DataFrame of the scalar columns. The raw report
+        is only looked up in raw_payloads and added as a ``data`` column (JSON
+        text) with ``include_data``.
+        """
+        import pyarrow as pa
+
+        fs = FinancialStatement
+        stmt = select(*fs.__table__.columns)
+        if company_id is not None:
+            stmt = stmt.where(fs.company_id == company_id)
+        if statement_type is not None:
+            stmt = stmt.where(fs.statement_type == statement_type)
+        if period is not None:
+            stmt = stmt.where(fs.period == period)
+        stmt = stmt.order_by(fs.fiscal_date.asc())
+        table = self.read_arrow(stmt)
+        if include_data:
+            hashes = table.column("payload_hash").to_pylist()
+            payloads = self.get_payloads(hashes)
+            data = [json.dumps(payloads[h], ensure_ascii=False) if h in payloads else None for h in hashes]
+            table = table.append_column("data", pa.array(data, type=pa.string()))
+        return table.to_pandas(date_as_object=True) if as_frame else table
+
+    # Financial facts
+    @staticmethod
+    def _fact_keys(rows: Iterable[dict]) -> set:
+        """``(company_id, fiscal_date)`` of the annual statement rows in ``rows``."""
+        return {
+            (r["company_id"], r["fiscal_date"])
+            for r in rows
+            if r.get("period") == "annual" and r.get("fiscal_date") is not None
+        }
+
+    def _refresh_facts(self, s: Session, keys: Optional[Iterable[tuple]] = None) -> int:
+        """
+        Recompute financial_facts from the annual statements of the given
+        ``(company_id, fiscal_date)`` keys (every key if None) inside session
+        ``s``. Facts whose statements are gone are deleted; unchanged facts
+        keep their ``updated_at``. Returns the number of keys refreshed.
+        """
+        fs, ff = FinancialStatement, FinancialFact
+        query = select(
+            fs.company_id,
+            fs.fiscal_date,
+            *[func.max(case((fs.statement_type == stype, getattr(fs, c)))).label(c)
+              for c, stype in FACT_COLUMN_SOURCES.items()],
+            *[func.max(case((fs.statement_type == t, 1), else_=0)).label(f"has_{t}")
+              for t in FACT_STATEMENT_TYPES],
+        ).where(fs.period == "annual", fs.fiscal_date.isnot(None)).group_by(fs.company_id, fs.fiscal_date)
+
+        if keys is None:
+            batches = [None]
+        else:
+            keys = list(keys)
+            batches = [keys[i:i + BULK_CHUNK_SIZE] for i in range(0, len(keys), BULK_CHUNK_SIZE)]
+        now = datetime.now(timezone.utc)
+        refreshed = 0
+        for batch in batches:
+            q = query if batch is None else query.where(tuple_(fs.company_id, fs.fiscal_date).in_(batch))
+            facts = []
+            for r in s.execute(q).mappings():
+                fact = dict(r, updated_at=now)
+                for t in FACT_STATEMENT_TYPES:
+                    fact[f"has_{t}"] = bool(fact[f"has_{t}"])
+                facts.append(fact)
+            stale = delete(ff)
+            if batch is None:
+                stale = stale.where(~select(fs.id).where(
+                    fs.company_id == ff.company_id, fs.fiscal_date == ff.fiscal_date, fs.period == "annual"
+                ).exists())
+            else:
+                gone = set(map(tuple, batch)) - {(f["company_id"], f["fiscal_date"]) for f in facts}
+                stale = stale.where(tuple_(ff.company_id, ff.fiscal_date).in_(list(gone))) if gone else None
+            if stale is not None:
+                s.execute(stale)
+            if not facts:
+                continue
+            if self._upsert_insert(ff.__table__) is None:
+                for fact in facts:
+                    row = s.query(ff).filter_by(company_id=fact["company_id"], fiscal_date=fact["fiscal_date"]).one_or_none()
+                    if row is None:
+                        s.add(ff(**fact))
+                    elif any(getattr(row, c) != fact[c] for c in FACT_VALUE_COLUMNS):
+                        for c, v in fact.items():
+                            setattr(row, c, v)
+                s.flush()
+            else:
+                self._bulk_upsert(
+                    ff.__table__, facts, FACT_KEY, FACT_VALUE_COLUMNS, None,
+                    touch_column="updated_at", session=s,
+                )
+            refreshed += len(facts)
+        return refreshed
+
+    def rebuild_financial_facts(self) -> int:
+        """Recompute every financial_facts row from financial_statements (e.g. after upgrading)."""
+        with self.session() as s:
+            refreshed = self._refresh_facts(s)
+            self._bump_version(s)
+            return refreshed
+
+    def bulk_upsert_metrics(self, rows: Iterable[dict], chunk_size: Optional[int] = None) -> int:
+        """
+        Insert or update many metrics (``company_id``, ``year``, ``metric_name``, ``value``)
+        in a few round trips, updating existing rows on u_company_year_metric
+        whose value differs. The metric_summaries rollups of the touched
+        (company, metric) pairs are refreshed in the same transaction. Returns
+        the number of rows inserted or changed (every row on backends without
+        ON CONFLICT), so callers can tell a no-op rewrite from a change.
+        """
+        rows = [{c: r.get(c) for c in METRIC_KEY + ("value",)} for r in rows]
+        if not rows:
+            return 0
+        if self._upsert_insert(Metric.__table__) is None:
+            for r in rows:
+                self.upsert_metric(**r)
+            return len(rows)
+        with self.session() as s:
+            written = self._bulk_upsert(
+                Metric.__table__, rows, METRIC_KEY, ("value",), chunk_size, session=s, skip_unchanged=True
+            )
+            self._refresh_summaries(s, {(r["metric_name"], r["company_id"]) for r in rows})
+        return written
+
+    @staticmethod
+    def _has_fact():
+        """Correlated EXISTS: a financial_facts row backs the metrics row's (company_id, year)."""
+        m, ff = Metric, FinancialFact
+        return select(ff.id).where(ff.company_id == m.company_id, extract("year", ff.fiscal_date) == m.year).exists()
+
+    def orphan_metric_years(self) -> set:
+        """``(company_id, year)`` pairs that still have metrics but no financial_facts row any more."""
+        m = Metric
+        with self.session() as s:
+            stmt = select(m.company_id, m.year).where(~self._has_fact()).distinct()
+            return {tuple(r) for r in s.execute(stmt)}
+
+    def prune_metrics(self, keys: Iterable[tuple]) -> int:
+        """
+        Delete the metrics of ``(company_id, year)`` keys that have no
+        financial_facts row (see orphan_metric_years) and refresh or drop the
+        affected metric_summaries. Returns the number of metrics deleted.
+        """
+        m, ms = Metric, MetricSummary
+        keys = list(keys)
+        deleted = 0
+        with self.session() as s:
+            for start in range(0, len(keys), BULK_CHUNK_SIZE):
+                orphans = and_(tuple_(m.company_id, m.year).in_(keys[start:start + BULK_CHUNK_SIZE]), ~self._has_fact())
+                pairs = [tuple(r) for r in s.execute(select(m.metric_name, m.company_id).where(orphans).distinct())]
+                deleted += s.execute(delete(m).where(orphans)).rowcount
+                if not pairs:
+                    continue
+                remaining = select(m.id).where(m.metric_name == ms.metric_name, m.company_id == ms.company_id)
+                s.execute(delete(ms).where(tuple_(ms.metric_name, ms.company_id).in_(pairs), ~remaining.exists()))
+                self._refresh_summaries(s, pairs)
+        return deleted
+
+    # Metric summaries
+    def _refresh_summaries(self, s: Session, keys: Optional[Iterable[tuple]] = None) -> int:
+        """
+        Recompute metric_summaries for ``(metric_name, company_id)`` keys (all
+        if None) from the metrics table inside session ``s``. Returns the
+        number of summaries written. First and latest year are those of the
+        first and last non-null value (lagged metrics start with a NULL year).
+        """
+        m = Metric
+        observed_year = case((m.value.isnot(None), m.year))
+        stats = select(
+            m.metric_name, m.company_id,
+            func.min(observed_year).label("first_year"),
+            func.max(observed_year).label("latest_year"),
+            func.min(m.value).label("min_value"),
+            func.max(m.value).label("max_value"),
+            func.count(m.value).label("years"),
+        ).group_by(m.metric_name, m.company_id)
+        if keys is None:
+            batches = [None]
+        else:
+            keys = list(keys)
+            batches = [keys[i:i + BULK_CHUNK_SIZE] for i in range(0, len(keys), BULK_CHUNK_SIZE)]
+        written = 0
+        for batch in batches:
+            q = stats if batch is None else stats.where(tuple_(m.metric_name, m.company_id).in_(batch))
+            summaries = {(r["metric_name"], r["company_id"]): dict(r) for r in s.execute(q).mappings()}
+            if not summaries:
+                continue
+            sub = q.subquery()
+            ends = select(m.metric_name, m.company_id, m.year, m.value).join(
+                sub,
+                (m.metric_name == sub.c.metric_name) & (m.company_id == sub.c.company_id)
+                & m.year.in_([sub.c.first_year, sub.c.latest_year]),
+            )
+            for name, cid, year, value in s.execute(ends):
+                summary = summaries[(name, cid)]
+                if year == summary["first_year"]:
+                    summary["first_value"] = value
+                if year == summary["latest_year"]:
+                    summary["latest_value"] = value
+            rows = []
+            for summary in summaries.values():
+                first, latest = summary.get("first_value"), summary.get("latest_value")
+                # no years without a single non-null value
+                span = summary["latest_year"] - summary["first_year"] if summary["years"] else 0
+                cagr = None
+                if span > 0 and first is not None and latest is not None and first > 0 and latest > 0:
+                    cagr = ((latest / first) ** (1.0 / span) - 1) * 100
+                rows.append(dict(summary, first_value=first, latest_value=latest, cagr=cagr))
+            if self._upsert_insert(MetricSummary.__table__) is None:
+                for r in rows:
+                    row = s.query(MetricSummary).filter_by(metric_name=r["metric_name"], company_id=r["company_id"]).one_or_none()
+                    if row is None:
+                        s.add(MetricSummary(**r))
+                    else:
+                        for c in SUMMARY_VALUE_COLUMNS:
+                            setattr(row, c, r[c])
+                s.flush()
+            else:
+                self._bulk_upsert(
+                    MetricSummary.__table__, rows, SUMMARY_KEY, SUMMARY_VALUE_COLUMNS, None, session=s, skip_unchanged=True
+                )
+            written += len(rows)
+        return written
+
+    def rebuild_metric_summaries(self) -> int:
+        """Recompute every metric_summaries row from the metrics table."""
+        with self.session() as s:
+            return self._refresh_summaries(s)
+
+    def get_metric_summaries(self, metric: str, companies: Optional[Sequence[str]] = None):
+        """
+        Rollups of one metric for the given company names (all if empty) as
+        a pandas DataFrame: company, ticker, first/latest year and value,
+        min/max, CAGR and number of years. One lookup on u_metric_company_summary.
+        """
+        ms = MetricSummary
+        stmt = (
+            select(Company.name.label("company"), Company.ticker, *[getattr(ms, c) for c in SUMMARY_VALUE_COLUMNS])
+            .join(Company, Company.id == ms.company_id)
+            .where(ms.metric_name == metric)
+        )
+        if companies:
+            stmt = stmt.where(Company.name.in_(list(companies)))
+        return self.read_frame(stmt.order_by(Company.name))
+
     # Financial statements
     def insert_financial_statement(
         self, 
@@ -68,7 +914,11 @@ class DBManager:
         operating_cashflow: Optional[float] = None,
         currency: Optional[str] = None,
     ) -> FinancialStatement:
-        """Insert or update financial statement (idempotent by company_id, statement_type, fiscal_date)."""
+        """
+        Insert or update financial statement (idempotent by company_id, statement_type, fiscal_date).
+        An unchanged statement (same fingerprint) is not written at all.
+        """
+        payload = self.hash_payload(data) if data is not None else None
         with self.session() as s:
             existing = s.query(FinancialStatement).filter_by(
                 company_id=company_id, 
@@ -76,35 +926,42 @@ class DBManager:
                 fiscal_date=fiscal_date
             ).one_or_none()
             
+            values = dict(
+                period=period,
+                payload_hash=payload[0] if payload else None,
+                revenue=revenue,
+                gross_profit=gross_profit,
+                net_income=net_income,
+                total_assets=total_assets,
+                total_liabilities=total_liabilities,
+                operating_cashflow=operating_cashflow,
+                currency=currency,
+            )
+            values["fingerprint"] = self.statement_fingerprint(values)
+            if existing and existing.fingerprint == values["fingerprint"]:
+                return existing
+            if payload:
+                self._store_payloads(s, dict([payload]))
             if existing:
-                existing.data = data
-                existing.period = period
-                existing.revenue = revenue
-                existing.gross_profit = gross_profit
-                existing.net_income = net_income
-                existing.total_assets = total_assets
-                existing.total_liabilities = total_liabilities
-                existing.operating_cashflow = operating_cashflow
-                existing.currency = currency
+                for k, v in values.items():
+                    setattr(existing, k, v)
+                existing.updated_at = datetime.now(timezone.utc)
                 s.flush()
+                self._refresh_facts(s, self._fact_keys([dict(values, company_id=company_id, fiscal_date=fiscal_date)]))
+                self._bump_version(s)
                 return existing
             
             fs = FinancialStatement(
                 company_id=company_id, 
                 statement_type=statement_type, 
-                period=period, 
                 fiscal_date=fiscal_date, 
-                data=data,
-                revenue=revenue,
-                gross_profit=gross_profit,
-                net_income=net_income,
-                total_assets=total_assets,
-                total_liabilities=total_liabilities,
-                operating_cashflow=operating_cashflow,
-                currency=currency,
+                updated_at=datetime.now(timezone.utc),
+                **values,
             )
             s.add(fs)
             s.flush()
+            self._refresh_facts(s, self._fact_keys([dict(values, company_id=company_id, fiscal_date=fiscal_date)]))
+            self._bump_version(s)
             return fs
 
     def fetch_financials(
@@ -114,7 +971,7 @@ class DBManager:
         period: Optional[str] = None
     ) -> List[FinancialStatement]:
         """Fetch financial statements with optional filters."""
-        with self.session() as s:
+        with self.read_session() as s:
             q = s.query(FinancialStatement)
             if company_id is not None:
                 q = q.filter(FinancialStatement.company_id == company_id)
@@ -124,6 +981,89 @@ class DBManager:
                 q = q.filter(FinancialStatement.period == period)
             return q.order_by(FinancialStatement.fiscal_date.asc()).all()
 
+    def fetch_facts_frame(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        company_ids: Optional[Iterable[int]] = None,
+    ):
+        """
+        Fetch ``company_id``, ``fiscal_date``, the given fact columns (default:
+        all) and the ``has_<statement_type>`` flags from financial_facts in one
+        query, as a pandas DataFrame ordered by company and fiscal date.
+        """
+        ff = FinancialFact
+        columns = list(FACT_COLUMN_SOURCES) if columns is None else list(columns)
+        stmt = select(
+            ff.company_id, ff.fiscal_date,
+            *[getattr(ff, c) for c in columns],
+            *[getattr(ff, f"has_{t}") for t in FACT_STATEMENT_TYPES],
+        )
+        if company_ids is not None:
+            stmt = stmt.where(ff.company_id.in_(list(company_ids)))
+        return self.read_frame(stmt.order_by(ff.company_id, ff.fiscal_date))
+
+    def fetch_changed_facts(self, since: Optional[datetime]) -> List[tuple]:
+        """
+        ``(company_id, fiscal_date)`` of facts whose values changed after
+        ``since`` (all facts if None). ``updated_at`` is stamped before the
+        writing transaction commits, so a later commit can carry an earlier
+        stamp than rows already seen; callers keep ``since`` behind the
+        longest load transaction (see scripts/calc_metrics.py).
+        """
+        ff = FinancialFact
+        stmt = select(ff.company_id, ff.fiscal_date)
+        if since is not None:
+            stmt = stmt.where(ff.updated_at > since)
+        with self.session() as s:
+            return [tuple(r) for r in s.execute(stmt)]
+
+    def latest_fact_change(self) -> Optional[datetime]:
+        """Most recent ``updated_at`` across financial_facts (None if empty)."""
+        with self.session() as s:
+            return s.execute(select(func.max(FinancialFact.updated_at))).scalar()
+
+    # Pipeline state
+    def get_watermark(self, name: str) -> Optional[datetime]:
+        """High-water mark stored for pipeline step ``name`` (None if it never ran)."""
+        with self.session() as s:
+            state = s.get(PipelineState, name)
+            return state.watermark if state else None
+
+    def set_watermark(self, name: str, watermark: Optional[datetime]) -> None:
+        with self.session() as s:
+            state = s.get(PipelineState, name)
+            if state is None:
+                s.add(PipelineState(name=name, watermark=watermark))
+            else:
+                state.watermark = watermark
+
+    def get_data_version(self, name: str = "data") -> int:
+        """Current value of counter ``name`` (0 if never bumped); one primary-key lookup."""
+        with self.read_session() as s:
+            version = s.execute(select(PipelineState.version).where(PipelineState.name == name)).scalar()
+            return version or 0
+
+    def bump_data_version(self, name: str = "data") -> int:
+        """Atomically increment counter ``name`` and return the new value."""
+        with self.session() as s:
+            return self._bump_version(s, name)
+
+    def _bump_version(self, s: Session, name: str = "data") -> int:
+        """bump_data_version inside ``s``, so the bump commits with the writes it announces."""
+        t = PipelineState.__table__
+        stmt = self._upsert_insert(t)
+        if stmt is not None:
+            # one statement: concurrent first bumps cannot both try to insert the row
+            stmt = stmt.values(name=name, version=1).on_conflict_do_update(
+                index_elements=["name"], set_={"version": func.coalesce(t.c.version, 0) + 1, "updated_at": func.now()},
+            )
+            return s.execute(stmt.returning(t.c.version)).scalar_one()
+        bumped = s.execute(t.update().where(t.c.name == name).values(version=func.coalesce(t.c.version, 0) + 1))
+        if bumped.rowcount == 0:
+            s.add(PipelineState(name=name, version=1))
+            return 1
+        return s.execute(select(t.c.version).where(t.c.name == name)).scalar()
+
     # Metrics
     def upsert_metric(self, company_id: int, year: int, metric_name: str, value: Optional[float]) -> Metric:
         """Insert or update metric (idempotent by company_id, year, metric_name)."""
@@ -131,17 +1071,87 @@ class DBManager:
             m = s.query(Metric).filter_by(company_id=company_id, year=year, metric_name=metric_name).one_or_none()
             if m:
                 m.value = value
-                s.flush()
-                return m
-            m = Metric(company_id=company_id, year=year, metric_name=metric_name, value=value)
-            s.add(m)
+            else:
+                m = Metric(company_id=company_id, year=year, metric_name=metric_name, value=value)
+                s.add(m)
             s.flush()
+            self._refresh_summaries(s, [(metric_name, company_id)])
             return m
 
     def get_metrics(self, company_id: Optional[int] = None) -> List[Metric]:
         """Retrieve metrics with optional company filter."""
-        with self.session() as s:
+        with self.read_session() as s:
             q = s.query(Metric)
             if company_id is not None:
                 q = q.filter(Metric.company_id == company_id)
-            return q.order_by(Metric.company_id, Metric.year).all()
\ No newline at end of file
+            return q.order_by(Metric.company_id, Metric.year).all()
+
+    # Dashboard queries
+    def query_metrics(
+        self,
+        metric: str,
+        companies: Optional[Sequence[str]] = None,
+        year_range: Optional[Sequence[int]] = None,
+    ):
+        """
+        One metric (or raw fact column such as ``revenue``) for the given
+        company names and inclusive ``(first, last)`` year range, filtered and
+        projected in SQL. Returns a pandas DataFrame with company_id, company,
+        ticker, year, metric and value, ordered by company and year; empty
+        filters mean no restriction.
+        """
+        import pandas as pd
+
+        columns = ["company_id", "company", "ticker", "year", "metric", "value"]
+        if metric in FACT_COLUMN_SOURCES:
+            ff = FinancialFact
+            value = getattr(ff, metric)
+            stmt = (
+                select(ff.company_id, Company.name, Company.ticker, ff.fiscal_date, value)
+                .join(Company, Company.id == ff.company_id)
+                .where(value.isnot(None))
+            )
+            if year_range:
+                stmt = stmt.where(ff.fiscal_date.between(date(year_range[0], 1, 1), date(year_range[1], 12, 31)))
+        else:
+            m = Metric
+            stmt = (
+                select(m.company_id, Company.name, Company.ticker, m.year, m.value)
+                .join(Company, Company.id == m.company_id)
+                .where(m.metric_name == metric)
+            )
+            if year_range:
+                stmt = stmt.where(m.year.between(year_range[0], year_range[1]))
+        if companies:
+            stmt = stmt.where(Company.name.in_(list(companies)))
+
+        df = self.read_frame(stmt)
+        df.columns = ["company_id", "company", "ticker", "year", "value"]
+        if metric in FACT_COLUMN_SOURCES and not df.empty:
+            # facts are keyed by fiscal date; keep the latest one of each year
+            df["year"] = pd.to_datetime(df["year"]).dt.year.astype("int64")
+            df = df.sort_values(["company_id", "year"], kind="stable").drop_duplicates(["company_id", "year"], keep="last")
+        df["metric"] = metric
+        df["value"] = df["value"].astype("float64")
+        return df[columns].sort_values(["company", "year"]).reset_index(drop=True)
+
+    def metric_dimensions(self) -> dict:
+        """
+        Filter options for the dashboards from a few aggregate queries:
+        ``companies`` (names), ``metrics`` (stored metrics plus fact columns
+        holding data) and ``years`` (``(min, max)`` or None).
+        """
+        ff = FinancialFact
+        with self.read_session() as s:
+            companies = s.execute(select(Company.name).order_by(Company.name)).scalars().all()
+            metrics = s.execute(select(Metric.metric_name).distinct()).scalars().all()
+            ymin, ymax = s.execute(select(func.min(Metric.year), func.max(Metric.year))).one()
+            counts = s.execute(select(*[func.count(getattr(ff, c)) for c in FACT_COLUMN_SOURCES])).one()
+            dmin, dmax = s.execute(select(func.min(ff.fiscal_date), func.max(ff.fiscal_date))).one()
+        metrics = sorted(set(metrics) | {c for c, n in zip(FACT_COLUMN_SOURCES, counts) if n})
+        years = [y for y in (ymin, ymax, dmin and dmin.year, dmax and dmax.year) if y is not None]
+        return {
+            "companies": list(companies),
+            "metrics": metrics,
+            "years": (min(years), max(years)) if years else None,
+        }
@@ -1,27 +1,144 @@
 from alphavantage_client import AlphaVantageClient
-import time
+from rate_limiter import DailyQuotaExceeded
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Alpha Vantage function -> key used in the extracted payload
+STATEMENT_KEYS = {
+    "INCOME_STATEMENT": "income_statement",
+    "BALANCE_SHEET": "balance_sheet",
+    "CASH_FLOW": "cash_flow_statement",
+}
 
 class Extractor:
-    def __init__(self, api_client: AlphaVantageClient, companies):
+    def __init__(self, api_client: AlphaVantageClient, companies, max_workers: int = 1, sink=None):
         self.api_client = api_client
         self.companies = companies  # waits dict {name: ticker}
+        self.max_workers = max(1, int(max_workers or 1))
+        # optional callback(name, ticker, statements) run as soon as a company is complete,
+        # so results are persisted incrementally instead of only at the end of the run
+        self.sink = sink
+        self.failures = {}  # {name: error message} of companies that could not be fetched
 
     def fetch_financial_statements(self):
+        self.failures = {}
+        if self.max_workers > 1:
+            return self.fetch_financial_statements_concurrent()
+        # pacing is handled by the client's rate limiter; a company is only started
+        # when the daily budget covers all of its calls, so none is left half-fetched
         financial_data = {}
         for name, ticker in self.companies.items():
-            time.sleep(1)  # To respect API rate limits
-            income_statement = self.api_client.get_income_statement(ticker)
-            time.sleep(1)  # To respect API rate limits
-            balance_sheet = self.api_client.get_balance_sheet(ticker)
-            time.sleep(1)  # To respect API rate limits
-            cash_flow_statement = self.api_client.get_cash_flow_statement(ticker)
+            needed = self.api_client.calls_needed(ticker, STATEMENT_KEYS)
+            remaining = self.api_client.rate_limiter.remaining_today()
+            if remaining < needed:
+                logger.warning("Daily API budget has %d calls left, %s needs %d; stopping (%d of %d companies fetched)",
+                               remaining, name, needed, len(financial_data), len(self.companies))
+                break
+            try:
+                income_statement = self.api_client.get_income_statement(ticker)
+                balance_sheet = self.api_client.get_balance_sheet(ticker)
+                cash_flow_statement = self.api_client.get_cash_flow_statement(ticker)
+            except DailyQuotaExceeded as e:
+                logger.warning("%s; stopping before %s (%d of %d companies fetched)",
+                               e, name, len(financial_data), len(self.companies))
+                break
+            except Exception as e:
+                logger.error("Failed to fetch statements for %s (%s): %s", name, ticker, e)
+                self.failures[name] = str(e)
+                continue
 
             financial_data[name] = {
                 'income_statement': income_statement,
                 'balance_sheet': balance_sheet,
                 'cash_flow_statement': cash_flow_statement
             }
+            self._emit(name, ticker, financial_data)
+        return financial_data
+
+    def _emit(self, name, ticker, financial_data):
+        if self.sink is None:
+            return
+        try:
+            self.sink(name, ticker, financial_data[name])
+        except Exception as e:
+            logger.error("Failed to persist statements for %s (%s): %s", name, ticker, e)
+            self.failures[name] = str(e)
+            del financial_data[name]
+
+    def fetch_financial_statements_concurrent(self):
+        """
+        Fan out one request per (company, statement) over a bounded thread pool.
+
+        All workers share the client's rate limiter, so the pool only overlaps
+        network wait time and never exceeds the API quota. A company is only
+        submitted while the daily budget covers all of its calls, and at most
+        ``2 * max_workers`` companies are in flight. Companies are returned in
+        input order and only when all of their statements were fetched.
+        """
+        quota_hit = threading.Event()
+
+        def fetch(ticker, function):
+            if quota_hit.is_set():
+                return None
+            try:
+                return self.api_client.fetch_financial_statements(ticker, function)
+            except DailyQuotaExceeded as e:
+                if not quota_hit.is_set():
+                    quota_hit.set()
+                    logger.warning("%s; cancelling remaining requests", e)
+                return None
+            except Exception as e:
+                return e
+
+        financial_data = {}
+        pending = deque()  # (name, {key: future}) in input order
+
+        def collect():
+            name, statement_futures = pending.popleft()
+            statements = {key: f.result() for key, f in statement_futures.items()}
+            errors = [v for v in statements.values() if isinstance(v, Exception)]
+            if errors:
+                logger.error("Failed to fetch statements for %s (%s): %s", name, self.companies[name], errors[0])
+                self.failures[name] = str(errors[0])
+                return
+            if any(v is None for v in statements.values()):
+                return
+            financial_data[name] = statements
+            self._emit(name, self.companies[name], financial_data)
+
+        budget = self.api_client.rate_limiter.remaining_today()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract") as pool:
+            for name, ticker in self.companies.items():
+                if quota_hit.is_set():
+                    break
+                needed = self.api_client.calls_needed(ticker, STATEMENT_KEYS)
+                if needed > budget:
+                    # retries may have spent more than planned: settle what is in flight and re-check
+                    while pending:
+                        collect()
+                    budget = self.api_client.rate_limiter.remaining_today()
+                    if needed > budget:
+                        logger.warning("Daily API budget has %d calls left, %s needs %d; stopping",
+                                       budget, name, needed)
+                        break
+                budget -= needed
+                pending.append((name, {
+                    key: pool.submit(fetch, ticker, function)
+                    for function, key in STATEMENT_KEYS.items()
+                }))
+                while len(pending) > 2 * self.max_workers:
+                    collect()
+            while pending:
+                collect()
+
+        if len(financial_data) + len(self.failures) < len(self.companies):
+            logger.warning("Daily API budget exhausted (%d of %d companies fetched)",
+                           len(financial_data), len(self.companies))
         return financial_data
 
     def extract_data(self):
-        return self.fetch_financial_statements()
\ No newline at end of file
+        return self.fetch_financial_statements()
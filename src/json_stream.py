@@ -0,0 +1,128 @@
+"""Incremental JSON reader for walking large documents without loading them into memory."""
+import json
+from typing import IO, Any, Iterator
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class JSONStreamReader:
+    """
+    Pull-style reader over a text stream holding one JSON document.
+
+    Containers are walked with ``iter_object()`` / ``iter_array()``; at each
+    step the caller consumes the current value with ``read_value()`` (decode
+    it), ``skip_value()`` (discard it) or by descending with another
+    ``iter_*`` call. Only the value being decoded is held in memory, plus a
+    read-ahead buffer of ``chunk_size`` characters.
+
+    Example:
+        for company in reader.iter_object():
+            for key in reader.iter_object():
+                value = reader.read_value()
+    """
+
+    def __init__(self, fp: IO[str], chunk_size: int = 1 << 16):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text. False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Expected {ch!r} in JSON stream, got {got or 'EOF'!r}")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decode and return the value at the current position."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a value touching the end of the buffer may be truncated, and a number may
+            # also stop early on a partial fraction or exponent ("1." + "5", "2.25e" + "3")
+            truncated = end == len(self._buf) or (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                and all(c in _NUMBER_CHARS for c in self._buf[end:])
+            )
+            if truncated and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Consume the value at the current position, descending into containers."""
+        ch = self.peek()
+        if ch == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        elif ch == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position, positioned at each value."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key in JSON stream, got {key!r}")
+            self._expect(":")
+            yield key
+            ch = self.peek()
+            self._pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise ValueError(f"Expected ',' or '}}' in JSON stream, got {ch or 'EOF'!r}")
+
+    def iter_array(self) -> Iterator[int]:
+        """Yield the index of each element of the array at the current position."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        i = 0
+        while True:
+            yield i
+            i += 1
+            ch = self.peek()
+            self._pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON stream, got {ch or 'EOF'!r}")
@@ -1,43 +1,121 @@
 # windborne-extractor/windborne-extractor/src/main.py
 
+import argparse
 import os
 from dotenv import load_dotenv
 
 # Load environment variables early so `config` can read them
 load_dotenv()
 
-from config import API_KEY, COMPANIES
+from config import (
+    API_KEY, COMPANIES, FINANCIAL_STATEMENTS, CALLS_PER_MINUTE, REQUEST_LIMIT, RATE_LIMIT_STATE,
+    HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_BACKOFF_MAX, HTTP_TIMEOUT,
+    CACHE_DIR, CACHE_TTL_DAYS, REFRESH_QUEUE_STATE, RAW_DIR, RAW_COMPRESS,
+)
 from alphavantage_client import AlphaVantageClient
+from response_cache import ResponseCache
+from rate_limiter import RateLimiter
+from refresh_queue import RefreshQueue, DAY
+from raw_store import RawStore
 from extractor import Extractor
-import json
 from logger import get_logger
-from pathlib import Path
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract financial statements from Alpha Vantage.")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of concurrent fetch workers (1 = serial). All workers share one rate limiter.",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Bypass the on-disk response cache and fetch everything from the API.",
+    )
+    parser.add_argument(
+        "--all", action="store_true",
+        help="Refresh every company instead of draining the staleness-ordered refresh queue.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     logger = get_logger(__name__)
 
+    # Rate limiter state is persisted so the daily budget survives restarts
+    rate_limiter = RateLimiter(
+        calls_per_minute=CALLS_PER_MINUTE,
+        calls_per_day=REQUEST_LIMIT,
+        state_path=RATE_LIMIT_STATE,
+    )
+    logger.info("API budget remaining today: %d of %d calls.", rate_limiter.remaining_today(), REQUEST_LIMIT)
+
+    # Cached statements younger than CACHE_TTL_DAYS cost no API call
+    cache = None if args.no_cache else ResponseCache(CACHE_DIR, ttl=CACHE_TTL_DAYS * 86400)
+
     # Initialize the Alpha Vantage client
-    av_client = AlphaVantageClient(api_key=API_KEY)
+    av_client = AlphaVantageClient(
+        api_key=API_KEY,
+        rate_limiter=rate_limiter,
+        max_retries=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        backoff_max=HTTP_BACKOFF_MAX,
+        timeout=HTTP_TIMEOUT,
+        pool_maxsize=max(args.workers, 1),
+        cache=cache,
+    )
+
+    # Pick the stalest companies that fit in today's remaining API budget
+    queue = RefreshQueue(REFRESH_QUEUE_STATE, max_age_days=CACHE_TTL_DAYS)
+    queue.sync(COMPANIES)
+    logger.info(queue.summary())
+    if args.all:
+        batch = dict(COMPANIES)
+    else:
+        batch = queue.next_batch(rate_limiter.remaining_today() // len(FINANCIAL_STATEMENTS))
+        if cache is not None:
+            # a company inside its filing window is due before the cache TTL runs out; mark
+            # only its statements older than the queue's limit stale so they are revalidated
+            # with a conditional request (a 304 keeps the cached body)
+            for name, ticker in batch.items():
+                cache.expire_symbol(ticker, older_than=queue.max_age(name) * DAY)
+
+    # Each company is landed (and ticked off the queue) as soon as it is complete,
+    # so a crash midway keeps everything fetched so far and the next run resumes
+    store = RawStore(RAW_DIR, compress=RAW_COMPRESS)
+
+    def land(name, ticker, statements):
+        store.write_company(name, ticker, statements)
+        if name in queue.entries:
+            reports = (statements.get("income_statement") or {}).get("annualReports") or []
+            queue.mark_success(name, reports[0].get("fiscalDateEnding") if reports else None)
+            queue.save()
+        logger.info("Company=%s statements=%s landed in %s", name, list(statements.keys()), RAW_DIR)
 
     # Initialize the extractor with the client and companies
-    extractor = Extractor(api_client=av_client, companies=COMPANIES)
+    extractor = Extractor(api_client=av_client, companies=batch, max_workers=args.workers, sink=land)
 
-    logger.info("Starting data extraction for %d companies.", len(COMPANIES))
+    logger.info("Starting data extraction for %d of %d companies (workers=%d).",
+                len(batch), len(COMPANIES), extractor.max_workers)
 
     # Trigger the data extraction process
     financial_data = extractor.extract_data()
 
-    try:
-        with open(r"data\\financial_data.json", 'w', encoding='utf-8') as f:            
-            json.dump(financial_data, f, indent=4, ensure_ascii=False)        
-        logger.info("Financial data saved to data\\financial_data.json")
-    except Exception as e:
-        logger.error("Failed to save financial data: %s", e)        
-
-    for company, statements in financial_data.items():
-        logger.info("Company=%s statements=%s", company, list(statements.keys()))
+    for name, error in extractor.failures.items():
+        if name in queue.entries:
+            queue.mark_failure(name, error)
+    queue.save()
+    logger.info("Landed %d companies (%d failed).", len(financial_data), len(extractor.failures))
 
+    latency = av_client.latency_summary()
+    if latency["calls"]:
+        logger.info(
+            "HTTP calls=%d latency mean=%.0fms p50=%.0fms p95=%.0fms max=%.0fms",
+            latency["calls"], latency["mean_ms"], latency["p50_ms"], latency["p95_ms"], latency["max_ms"],
+        )
+    if cache is not None:
+        logger.info(cache.report())
+    av_client.close()
 
     logger.info("Data extraction completed.")
 
@@ -0,0 +1,124 @@
+"""Columnar metric computation: all companies and years in one vectorized pass."""
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.metric_registry import COLUMN_SOURCES, MetricDef, is_lagged, required_columns, resolve, source_statements
+
+
+def annual_rows(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce statements to one row per (company_id, year), keeping the latest
+    fiscal date of each year, sorted by company and year.
+    """
+    df = frame.copy()
+    df["year"] = pd.to_datetime(df["fiscal_date"]).dt.year
+    df = df.sort_values(["company_id", "fiscal_date"], kind="stable")
+    df = df.drop_duplicates(["company_id", "year"], keep="last").reset_index(drop=True)
+    for c in df.columns.difference(["company_id", "fiscal_date", "year"]):
+        df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+    return df
+
+
+def statement_frame(frame: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """
+    Reduce facts to one row per company and year.
+
+    Args:
+        frame: financial facts with company_id, fiscal_date, the ``columns``
+            and ``has_<statement_type>`` flags (see DBManager.fetch_facts_frame)
+        columns: fact columns to keep; each is taken from the latest fiscal
+            date of the year that reported its statement type (COLUMN_SOURCES)
+
+    Returns:
+        One row per (company_id, year) with ``columns`` and a boolean
+        ``has_<statement_type>`` flag per source statement type
+    """
+    by_type = {}
+    for column in columns:
+        by_type.setdefault(COLUMN_SOURCES[column], []).append(column)
+    joined: Optional[pd.DataFrame] = None
+    for stype, cols in by_type.items():
+        reported = frame[f"has_{stype}"].astype(bool)
+        part = annual_rows(frame.loc[reported, ["company_id", "fiscal_date"] + cols])
+        part = part.drop(columns="fiscal_date").assign(**{f"has_{stype}": True})
+        joined = part if joined is None else joined.merge(part, on=["company_id", "year"], how="outer")
+    for stype in by_type:
+        joined[f"has_{stype}"] = joined[f"has_{stype}"].fillna(False).astype(bool)
+    return joined.sort_values(["company_id", "year"], kind="stable").reset_index(drop=True)
+
+
+def _lagged(df: pd.DataFrame, column: str) -> pd.Series:
+    """``column`` of the company's previous year reporting it (not necessarily year - 1)."""
+    reported = df[f"has_{COLUMN_SOURCES[column]}"]
+    return df.loc[reported].groupby("company_id", sort=False)[column].shift(1).reindex(df.index)
+
+
+def compute_metrics(frame: pd.DataFrame, metrics: Optional[List[MetricDef]] = None) -> pd.DataFrame:
+    """
+    Evaluate registered metrics for every company and year in one vectorized pass.
+
+    Metrics run in dependency order; each is emitted for the years in which
+    all statements it reads were reported.
+
+    Args:
+        frame: financial facts holding at least ``required_columns(metrics)``
+        metrics: metric definitions in evaluation order (default: resolve())
+
+    Returns:
+        Long DataFrame with company_id, year, metric_name, value (NaN = no value)
+    """
+    metrics = resolve() if metrics is None else metrics
+    empty = pd.DataFrame(columns=["company_id", "year", "metric_name", "value"])
+    if frame.empty or not metrics:
+        return empty
+    df = statement_frame(frame, required_columns(metrics))
+    values = {c: df[c] for c in required_columns(metrics)}
+    for column in {c for m in metrics for c in m.lags}:
+        values[f"prev_{column}"] = _lagged(df, column)
+    parts = []
+    for m in metrics:
+        values[m.name] = m.formula(values)
+        emitted = df[[f"has_{t}" for t in source_statements(m)]].all(axis=1)
+        parts.append(pd.DataFrame({
+            "company_id": df.loc[emitted, "company_id"],
+            "year": df.loc[emitted, "year"],
+            "metric_name": m.name,
+            "value": values[m.name][emitted].astype("float64"),
+        }))
+    long = pd.concat(parts, ignore_index=True)
+    if long.empty:
+        return empty
+    return long.sort_values(["company_id", "year", "metric_name"], kind="stable").reset_index(drop=True)
+
+
+def restrict_to_changes(metrics: pd.DataFrame, changed: Iterable[Tuple[int, int]]) -> pd.DataFrame:
+    """
+    Keep only metrics affected by changed statements.
+
+    Args:
+        metrics: output of compute_metrics
+        changed: ``(company_id, year)`` pairs whose statements changed
+
+    Returns:
+        All metrics of the changed pairs, plus each lagged metric's value
+        for the company's next year reporting it
+    """
+    changed = set(changed)
+    if metrics.empty or not changed:
+        return metrics.iloc[0:0]
+    lagged = [m.name for m in resolve(metrics["metric_name"].unique()) if is_lagged(m)]
+    m = metrics.sort_values(["company_id", "metric_name", "year"], kind="stable")
+    prev_year = m.groupby(["company_id", "metric_name"], sort=False)["year"].shift(1).fillna(-1).astype(int)
+    own = pd.MultiIndex.from_arrays([m["company_id"], m["year"]]).isin(changed)
+    prev = pd.MultiIndex.from_arrays([m["company_id"], prev_year]).isin(changed)
+    keep = own | (prev & m["metric_name"].isin(lagged))
+    return metrics.loc[m.index[keep]].sort_index().reset_index(drop=True)
+
+
+def to_rows(metrics: pd.DataFrame) -> List[dict]:
+    """Metric frame -> list of plain dicts for DBManager.bulk_upsert_metrics (NaN -> None)."""
+    return [
+        {"company_id": int(c), "year": int(y), "metric_name": m, "value": None if pd.isna(v) else float(v)}
+        for c, y, m, v in metrics[["company_id", "year", "metric_name", "value"]].itertuples(index=False, name=None)
+    ]
@@ -0,0 +1,163 @@
+"""Declarative metric definitions: inputs, formula, unit and dependencies of every derived metric."""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.models import FACT_COLUMN_SOURCES as COLUMN_SOURCES
+
+if TYPE_CHECKING:  # numpy/pandas load lazily so the dashboards can import units cheaply
+    import pandas as pd
+
+# units of the raw normalized columns, shown next to metrics in the dashboards
+COLUMN_UNITS = {column: "USD" for column in COLUMN_SOURCES}
+
+
+@dataclass(frozen=True)
+class MetricDef:
+    """
+    One derived metric.
+
+    ``formula`` receives a mapping holding each of ``inputs`` (columns of
+    FinancialFact), ``prev_<column>`` for each of ``lags`` (the value of
+    the company's previous reported year) and each metric in ``depends_on``,
+    all as aligned pandas Series, and returns the metric as a Series.
+    """
+    name: str
+    formula: Callable[[Mapping[str, "pd.Series"]], "pd.Series"]
+    unit: str = ""
+    inputs: Tuple[str, ...] = ()
+    lags: Tuple[str, ...] = ()
+    depends_on: Tuple[str, ...] = ()
+    description: str = ""
+
+
+REGISTRY: Dict[str, MetricDef] = {}
+
+
+def register(metric: MetricDef) -> MetricDef:
+    """Add ``metric`` to the registry; its columns must be known and its name unused."""
+    unknown = [c for c in metric.inputs + metric.lags if c not in COLUMN_SOURCES]
+    if unknown:
+        raise ValueError(f"Metric {metric.name} uses unknown columns: {unknown}")
+    if metric.name in REGISTRY or metric.name in COLUMN_SOURCES:
+        raise ValueError(f"Metric {metric.name} is already defined")
+    REGISTRY[metric.name] = metric
+    return metric
+
+
+def resolve(names: Optional[Iterable[str]] = None) -> List[MetricDef]:
+    """
+    ``names`` (default: all registered metrics) plus their dependencies, in
+    evaluation order. Raises ValueError on unknown names or dependency cycles.
+    """
+    order: List[MetricDef] = []
+    state: Dict[str, str] = {}  # name -> "visiting" | "done"
+
+    def visit(name: str, path: Tuple[str, ...]) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Metric dependency cycle: {' -> '.join(path + (name,))}")
+        if name not in REGISTRY:
+            raise ValueError(f"Unknown metric {name!r}")
+        state[name] = "visiting"
+        for dep in REGISTRY[name].depends_on:
+            visit(dep, path + (name,))
+        state[name] = "done"
+        order.append(REGISTRY[name])
+
+    for name in (REGISTRY if names is None else names):
+        visit(name, ())
+    return order
+
+
+def required_columns(metrics: Iterable[MetricDef]) -> List[str]:
+    """Columns (inputs and lagged inputs) needed to evaluate ``metrics``, in COLUMN_SOURCES order."""
+    needed = {c for m in metrics for c in m.inputs + m.lags}
+    return [c for c in COLUMN_SOURCES if c in needed]
+
+
+def source_statements(metric: MetricDef) -> List[str]:
+    """Statement types that must be reported for a year for ``metric`` to be emitted."""
+    types = {COLUMN_SOURCES[c] for c in metric.inputs + metric.lags}
+    for dep in metric.depends_on:
+        types.update(source_statements(REGISTRY[dep]))
+    return sorted(types)
+
+
+def is_lagged(metric: MetricDef) -> bool:
+    """True if ``metric`` reads the previous reported year, directly or through a dependency."""
+    return bool(metric.lags) or any(is_lagged(REGISTRY[d]) for d in metric.depends_on)
+
+
+def pct(numerator: "pd.Series", denominator: "pd.Series") -> "pd.Series":
+    """
+    ``numerator / denominator * 100`` element-wise, NaN where either side is
+    missing or the denominator is zero. A zero ratio is a real 0%.
+    """
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = numerator / denominator
+    valid = numerator.notna() & denominator.notna() & (denominator != 0)
+    return (ratio * 100).where(valid)
+
+
+def legacy_pct(numerator: "pd.Series", denominator: "pd.Series") -> "pd.Series":
+    """
+    pct, but NaN where the ratio itself is zero. Only for the original
+    metrics: it mirrors their per-row ``if safe_divide(...)`` check, so
+    their stored values stay identical.
+    """
+    ratio = pct(numerator, denominator)
+    return ratio.where(ratio != 0)
+
+
+# Built-in metrics
+register(MetricDef(
+    name="gross_margin",
+    unit="%",
+    inputs=("gross_profit", "revenue"),
+    formula=lambda v: legacy_pct(v["gross_profit"], v["revenue"]),
+    description="Gross profit as a share of revenue",
+))
+register(MetricDef(
+    name="net_margin",
+    unit="%",
+    inputs=("net_income", "revenue"),
+    formula=lambda v: legacy_pct(v["net_income"], v["revenue"]),
+    description="Net income as a share of revenue",
+))
+register(MetricDef(
+    name="revenue_yoy",
+    unit="%",
+    inputs=("revenue",),
+    lags=("revenue",),
+    formula=lambda v: legacy_pct(v["revenue"] - v["prev_revenue"], v["prev_revenue"]).where(
+        v["revenue"].notna() & (v["revenue"] != 0)
+    ),
+    description="Revenue growth over the previous reported year",
+))
+register(MetricDef(
+    name="roa",
+    unit="%",
+    inputs=("net_income", "total_assets"),
+    formula=lambda v: pct(v["net_income"], v["total_assets"]),
+    description="Return on assets: net income over total assets",
+))
+register(MetricDef(
+    name="debt_ratio",
+    unit="%",
+    inputs=("total_liabilities", "total_assets"),
+    formula=lambda v: pct(v["total_liabilities"], v["total_assets"]),
+    description="Total liabilities over total assets",
+))
+register(MetricDef(
+    name="ocf_margin",
+    unit="%",
+    inputs=("operating_cashflow", "revenue"),
+    formula=lambda v: pct(v["operating_cashflow"], v["revenue"]),
+    description="Operating cash flow as a share of revenue",
+))
+
+# metric/column name -> display unit
+METRIC_UNITS = dict(COLUMN_UNITS, **{name: m.unit for name, m in REGISTRY.items()})
@@ -1,20 +1,10 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, UniqueConstraint, Index, JSON as SQLA_JSON
+from sqlalchemy import Boolean, Column, Integer, String, Date, DateTime, Float, ForeignKey, LargeBinary, UniqueConstraint, Index, JSON as SQLA_JSON
 from sqlalchemy.sql import func
-from src.db import Base, engine
+from sqlalchemy.dialects.postgresql import JSONB
+from src.db import Base
 
-# prefer JSONB for postgres, fallback to SQL JSON for sqlite/dev
-try:
-    from sqlalchemy.dialects.postgresql import JSONB
-    JSON_TYPE = JSONB
-except Exception:
-    JSONB = None
-    JSON_TYPE = SQLA_JSON
-
-# detect engine dialect at runtime if needed
-if getattr(engine, "dialect", None) and getattr(engine.dialect, "name", None) == "postgresql" and JSONB is not None:
-    JSON_TYPE = JSONB
-else:
-    JSON_TYPE = SQLA_JSON
+# JSONB on postgres, generic JSON elsewhere (sqlite/dev); resolved per dialect, no engine needed at import
+JSON_TYPE = SQLA_JSON().with_variant(JSONB(), "postgresql")
 
 class Company(Base):
     __tablename__ = "companies"
@@ -31,7 +21,8 @@ class FinancialStatement(Base):
     statement_type = Column(String(64), nullable=False, index=True)
     period = Column(String(32), nullable=False)
     fiscal_date = Column(Date, nullable=True, index=True)
-    data = Column(JSON_TYPE, nullable=False)
+    # raw API report, stored once per distinct content in raw_payloads
+    payload_hash = Column(String(64), ForeignKey("raw_payloads.hash"), nullable=True)
     
     # Normalized columns for common metrics (indexed for fast queries)
     revenue = Column(Float, nullable=True, index=True)
@@ -41,8 +32,12 @@ class FinancialStatement(Base):
     total_liabilities = Column(Float, nullable=True)
     operating_cashflow = Column(Float, nullable=True)
     currency = Column(String(8), nullable=True)
+    # digest of the stored values (DBManager.statement_fingerprint); re-loads skip rows that match
+    fingerprint = Column(String(32), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # bumped only when the stored values actually change; drives incremental metric runs
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     __table_args__ = (
         UniqueConstraint("company_id", "statement_type", "fiscal_date", name="u_company_statement_fiscal"),
@@ -50,6 +45,55 @@ class FinancialStatement(Base):
         Index("ix_fs_revenue", "company_id", "revenue"),
     )
 
+class RawPayload(Base):
+    """
+    Raw statement reports keyed by the SHA-256 of their canonical JSON, so
+    identical reports are stored once and re-loads write nothing here.
+    """
+    __tablename__ = "raw_payloads"
+    hash = Column(String(64), primary_key=True)
+    encoding = Column(String(16), nullable=False)  # "json" or "zlib" (zlib-compressed json)
+    body = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # uncompressed bytes
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# normalized FinancialStatement column -> statement_type whose rows carry it
+FACT_COLUMN_SOURCES = {
+    "revenue": "income_statement",
+    "gross_profit": "income_statement",
+    "net_income": "income_statement",
+    "total_assets": "balance_sheet",
+    "total_liabilities": "balance_sheet",
+    "operating_cashflow": "cash_flow_statement",
+}
+
+class FinancialFact(Base):
+    """
+    Annual statements of one company and fiscal date joined into one wide row.
+    Maintained by DBManager alongside every statement upsert.
+    """
+    __tablename__ = "financial_facts"
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    fiscal_date = Column(Date, nullable=False)
+
+    revenue = Column(Float, nullable=True)
+    gross_profit = Column(Float, nullable=True)
+    net_income = Column(Float, nullable=True)
+    total_assets = Column(Float, nullable=True)
+    total_liabilities = Column(Float, nullable=True)
+    operating_cashflow = Column(Float, nullable=True)
+    # which statement types were reported for this fiscal date
+    has_income_statement = Column(Boolean, nullable=False, default=False)
+    has_balance_sheet = Column(Boolean, nullable=False, default=False)
+    has_cash_flow_statement = Column(Boolean, nullable=False, default=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    __table_args__ = (
+        UniqueConstraint("company_id", "fiscal_date", name="u_company_fact_fiscal"),
+    )
+
 class Metric(Base):
     __tablename__ = "metrics"
     id = Column(Integer, primary_key=True, index=True)
@@ -62,4 +106,32 @@ class Metric(Base):
     __table_args__ = (
         UniqueConstraint("company_id", "year", "metric_name", name="u_company_year_metric"),
         Index("ix_company_year_metric", "company_id", "year", "metric_name"),
-    )
\ No newline at end of file
+    )
+
+class MetricSummary(Base):
+    """Per (company, metric) rollup of the metrics history, maintained by DBManager on metric writes."""
+    __tablename__ = "metric_summaries"
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    metric_name = Column(String(64), nullable=False)
+    first_year = Column(Integer, nullable=True)
+    latest_year = Column(Integer, nullable=True)
+    first_value = Column(Float, nullable=True)
+    latest_value = Column(Float, nullable=True)
+    min_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+    cagr = Column(Float, nullable=True)  # % per year between first and latest value, if both positive
+    years = Column(Integer, nullable=True)  # number of years with a value
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("metric_name", "company_id", name="u_metric_company_summary"),
+    )
+
+class PipelineState(Base):
+    """Named high-water marks and counters of pipeline steps (e.g. metrics -> last fact change seen)."""
+    __tablename__ = "pipeline_state"
+    name = Column(String(64), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, nullable=True)  # counters, e.g. "data" bumped after metric writes
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
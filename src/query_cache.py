@@ -0,0 +1,123 @@
+"""Process-wide LRU cache for query results, invalidated by a data-version counter."""
+import logging
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory size of a cached result in bytes."""
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):  # pandas DataFrame / Series
+        usage = memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):  # pyarrow Table, numpy array
+        return nbytes
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache shared by every dashboard session in the process.
+
+    Entries are keyed by ``(name, params)`` and capped by total estimated
+    size (``max_bytes``) and optionally by count. ``version_fn`` returns the
+    current data version (e.g. DBManager.get_data_version); when it changes,
+    every entry is dropped, so results are reused exactly as long as the
+    underlying data is unchanged. The version is re-read at most every
+    ``check_interval`` seconds (0 = on every lookup).
+    """
+
+    def __init__(
+        self,
+        version_fn: Callable[[], Hashable],
+        max_bytes: int = 256 * 2**20,
+        max_entries: Optional[int] = None,
+        check_interval: float = 0.0,
+        clock=time.monotonic,
+    ):
+        self._version_fn = version_fn
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._version: Optional[Hashable] = None
+        self._checked_at: Optional[float] = None
+        self.stats = {"hit": 0, "miss": 0, "evicted": 0, "invalidated": 0}
+
+    def _sync_version(self) -> None:
+        now = self._clock()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+        version = self._version_fn()
+        with self._lock:
+            self._checked_at = now
+            if version != self._version:
+                if self._entries:
+                    logger.info(f"Data version {self._version} -> {version}; dropping {len(self._entries)} cached results")
+                    self.stats["invalidated"] += len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+
+    def get(self, name: str, params: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Cached result of ``loader()`` for ``(name, params)``; ``params`` must
+        be hashable (use tuples, not lists). Results are shared between
+        callers, so treat them as read-only.
+        """
+        self._sync_version()
+        key = (name, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hit"] += 1
+                return entry[0]
+            self.stats["miss"] += 1
+            version = self._version
+
+        value = loader()
+        size = estimate_size(value)
+        with self._lock:
+            if version != self._version or size > self.max_bytes:
+                return value  # data changed while loading, or too big to keep
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (
+                self._bytes > self.max_bytes
+                or (self.max_entries is not None and len(self._entries) > self.max_entries)
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.stats["evicted"] += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def report(self) -> str:
+        with self._lock:
+            return (
+                f"query cache: {len(self._entries)} entries, {self._bytes / 2**20:.1f}/{self.max_bytes / 2**20:.0f} MiB, "
+                f"version {self._version}, "
+                + ", ".join(f"{k} {v}" for k, v in self.stats.items())
+            )
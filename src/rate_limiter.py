@@ -0,0 +1,132 @@
+"""Client-side scheduling of Alpha Vantage calls against the per-minute and per-day quotas."""
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DailyQuotaExceeded(RuntimeError):
+    """Raised when the daily request budget has been used up."""
+
+
+class RateLimiter:
+    """
+    Hands out call slots so that no sliding window of ``period`` seconds holds
+    more than ``calls_per_minute`` calls and no UTC day more than ``calls_per_day``.
+
+    ``acquire()`` is thread-safe: a caller reserves the earliest legal slot under
+    the lock and sleeps outside of it, so concurrent callers are queued back to
+    back instead of polling. Granted slots are written to ``state_path`` (if set)
+    so the budget carries over when the process restarts.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: int = 5,
+        calls_per_day: int = 25,
+        state_path: Optional[str] = None,
+        period: float = 60.0,
+        margin: float = 0.5,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_day = calls_per_day
+        self.state_path = Path(state_path) if state_path else None
+        self.period = period
+        self.margin = margin
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._slots = []  # sorted timestamps of calls granted in the current window
+        self._day = None
+        self._day_count = 0
+        self._load_state()
+
+    @staticmethod
+    def _utc_day(ts: float) -> str:
+        return datetime.fromtimestamp(ts, tz=timezone.utc).date().isoformat()
+
+    def _load_state(self) -> None:
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable rate limit state {self.state_path}: {e}")
+            return
+        self._day = state.get("day")
+        self._day_count = int(state.get("day_count", 0))
+        self._slots = sorted(float(t) for t in state.get("slots", []))
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        state = {"day": self._day, "day_count": self._day_count, "slots": self._slots}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def _refresh(self, now: float) -> None:
+        """Drop slots that left the window and reset the counter on a new UTC day."""
+        cutoff = now - self.period - self.margin
+        del self._slots[:bisect.bisect_right(self._slots, cutoff)]
+        today = self._utc_day(now)
+        if self._day != today:
+            self._day = today
+            self._day_count = 0
+
+    def remaining_today(self) -> int:
+        """Number of calls still available in the current UTC day."""
+        with self._lock:
+            self._refresh(self._clock())
+            return max(self.calls_per_day - self._day_count, 0)
+
+    def reserve(self) -> float:
+        """
+        Reserve the earliest legal call slot without waiting for it.
+
+        Returns:
+            Absolute timestamp (same clock as ``clock``) at which the call may be sent
+
+        Raises:
+            DailyQuotaExceeded: if the daily budget is already used up
+        """
+        with self._lock:
+            now = self._clock()
+            self._refresh(now)
+            if self._day_count >= self.calls_per_day:
+                raise DailyQuotaExceeded(
+                    f"Daily API budget of {self.calls_per_day} calls used up for {self._day}"
+                )
+            slot = now
+            if len(self._slots) >= self.calls_per_minute:
+                slot = max(slot, self._slots[-self.calls_per_minute] + self.period + self.margin)
+            if self._slots:
+                slot = max(slot, self._slots[-1])
+            bisect.insort(self._slots, slot)
+            self._day_count += 1
+            self._save_state()
+            return slot
+
+    def acquire(self) -> float:
+        """
+        Block until the next call may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve() - self._clock()
+        if wait > 0:
+            logger.debug(f"Rate limit: waiting {wait:.2f}s for next call slot")
+            self._sleep(wait)
+            return wait
+        return 0.0
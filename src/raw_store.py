@@ -0,0 +1,119 @@
+"""Raw landing zone: one NDJSON file per (ticker, statement) plus a manifest of what landed when."""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# (payload key, period) pairs landed from each Alpha Vantage statement payload
+REPORT_SECTIONS = (("annualReports", "annual"), ("quarterlyReports", "quarterly"))
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers see either the old or the new file, never a partial one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class RawStore:
+    """
+    Lands raw statements under ``<root>/<TICKER>/<statement_type>.ndjson[.gz]``.
+
+    Each line is one report: ``{"company", "symbol", "statement_type",
+    "period", "report"}``. ``<root>/manifest.json`` maps ``TICKER/statement_type``
+    to the file path, its sha256, report count and landing time, so loaders
+    can pick up only files that changed.
+    """
+
+    def __init__(self, root: str = "data/raw", compress: bool = False):
+        self.root = Path(root)
+        self.compress = compress
+        self.manifest_path = self.root / "manifest.json"
+        self._lock = threading.Lock()
+        self.manifest: Dict[str, dict] = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        if not self.manifest_path.exists():
+            return {}
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+
+    def _save_manifest(self) -> None:
+        _atomic_write(self.manifest_path, json.dumps(self.manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+    @staticmethod
+    def key(ticker: str, statement_type: str) -> str:
+        return f"{ticker.upper()}/{statement_type}"
+
+    def path_for(self, ticker: str, statement_type: str) -> Path:
+        suffix = ".ndjson.gz" if self.compress else ".ndjson"
+        return self.root / ticker.upper() / f"{statement_type}{suffix}"
+
+    def write(self, company_name: str, ticker: str, statement_type: str, payload: dict) -> Optional[dict]:
+        """
+        Atomically land one statement payload and record it in the manifest.
+
+        Returns:
+            The manifest entry, or None if the payload held no reports
+        """
+        lines = []
+        for section, period in REPORT_SECTIONS:
+            for rep in (payload or {}).get(section) or []:
+                lines.append(json.dumps({
+                    "company": company_name,
+                    "symbol": ticker,
+                    "statement_type": statement_type,
+                    "period": period,
+                    "report": rep,
+                }, ensure_ascii=False, separators=(",", ":")))
+        if not lines:
+            logger.warning(f"No reports to land for {company_name} ({ticker}) {statement_type}")
+            return None
+
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.path_for(ticker, statement_type)
+        # mtime=0 keeps gzip output deterministic for unchanged content
+        _atomic_write(path, gzip.compress(body, mtime=0) if self.compress else body)
+
+        entry = {
+            "company": company_name,
+            "ticker": ticker,
+            "statement_type": statement_type,
+            "path": path.relative_to(self.root).as_posix(),
+            "sha256": digest,
+            "reports": len(lines),
+            "landed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            previous = self.manifest.get(self.key(ticker, statement_type))
+            if previous and previous["path"] != entry["path"]:
+                # compression setting changed; drop the other variant
+                (self.root / previous["path"]).unlink(missing_ok=True)
+            self.manifest[self.key(ticker, statement_type)] = entry
+            self._save_manifest()
+        return entry
+
+    def write_company(self, company_name: str, ticker: str, statements: Dict[str, dict]) -> None:
+        """Land every statement payload of one company (``{statement_type: payload}``)."""
+        for statement_type, payload in statements.items():
+            self.write(company_name, ticker, statement_type, payload)
+
+    def iter_records(self, entry: dict) -> Iterator[dict]:
+        """Stream the report records of one manifest entry."""
+        path = self.root / entry["path"]
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,147 @@
+"""Persistent, staleness-driven refresh queue for the ticker universe."""
+import json
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400.0
+
+
+class RefreshQueue:
+    """
+    Decides which companies to refresh next and remembers the outcome.
+
+    State is one JSON document keyed by company name holding the ticker, the
+    time of the last successful refresh, the latest fiscal year end seen and
+    the failure streak. A company is *due* when its data is older than
+    ``max_age_days``, or older than ``window_max_age_days`` while a new annual
+    report is expected (``window_start_days``..``window_end_days`` after the
+    next fiscal year end). Failing companies back off exponentially.
+
+    Due companies are ordered by how overdue they are, with a boost for
+    those inside their filing window and a penalty per recent failure.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/refresh_queue.json",
+        max_age_days: float = 30,
+        window_max_age_days: float = 7,
+        window_start_days: int = 30,
+        window_end_days: int = 100,
+        clock=time.time,
+    ):
+        self.path = Path(path)
+        self.max_age_days = max_age_days
+        self.window_max_age_days = window_max_age_days
+        self.window_start_days = window_start_days
+        self.window_end_days = window_end_days
+        self._clock = clock
+        self.entries: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable refresh queue {self.path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def sync(self, companies: Dict[str, str]) -> None:
+        """Track new companies, update changed tickers and drop removed ones."""
+        for name, ticker in companies.items():
+            entry = self.entries.setdefault(name, {"ticker": ticker, "failures": 0})
+            entry["ticker"] = ticker
+        for name in set(self.entries) - set(companies):
+            del self.entries[name]
+
+    def in_filing_window(self, entry: dict, now: float) -> bool:
+        """True if a new annual report is expected for ``entry`` around ``now``."""
+        latest = entry.get("latest_fiscal_date")
+        if not latest:
+            return False
+        try:
+            fye = date.fromisoformat(latest)
+        except ValueError:
+            return False
+        next_fye = fye + timedelta(days=365)
+        today = datetime.fromtimestamp(now, tz=timezone.utc).date()
+        return next_fye + timedelta(days=self.window_start_days) <= today <= next_fye + timedelta(days=self.window_end_days)
+
+    def max_age(self, name: str, now: Optional[float] = None) -> float:
+        """Age in days after which the data of company ``name`` is due for a refresh."""
+        now = self._clock() if now is None else now
+        return self.window_max_age_days if self.in_filing_window(self.entries[name], now) else self.max_age_days
+
+    def priority(self, entry: dict, now: Optional[float] = None) -> Optional[float]:
+        """
+        Priority score for ``entry``; higher refreshes first.
+
+        Returns:
+            float score, or None if the company is not due (fresh or backing off)
+        """
+        now = self._clock() if now is None else now
+        failures = int(entry.get("failures", 0))
+        last_attempt = entry.get("last_attempt")
+        if failures and last_attempt is not None:
+            backoff_days = min(2 ** (failures - 1), self.max_age_days)
+            if now - last_attempt < backoff_days * DAY:
+                return None
+
+        last_success = entry.get("last_success")
+        if last_success is None:
+            return float("inf")
+        in_window = self.in_filing_window(entry, now)
+        max_age = self.window_max_age_days if in_window else self.max_age_days
+        age_days = (now - last_success) / DAY
+        if age_days < max_age:
+            return None
+        return age_days / max_age + (1.0 if in_window else 0.0) - 0.25 * failures
+
+    def due(self) -> List[str]:
+        """Names of due companies, highest priority first."""
+        now = self._clock()
+        scored = [(self.priority(e, now), name) for name, e in self.entries.items()]
+        scored = [(p, name) for p, name in scored if p is not None]
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [name for _, name in scored]
+
+    def next_batch(self, max_companies: int) -> Dict[str, str]:
+        """Up to ``max_companies`` due companies as ``{name: ticker}``."""
+        names = self.due()[:max(max_companies, 0)]
+        return {name: self.entries[name]["ticker"] for name in names}
+
+    def mark_success(self, name: str, latest_fiscal_date: Optional[str] = None) -> None:
+        entry = self.entries[name]
+        now = self._clock()
+        entry["last_attempt"] = now
+        entry["last_success"] = now
+        entry["failures"] = 0
+        entry.pop("last_error", None)
+        if latest_fiscal_date:
+            entry["latest_fiscal_date"] = latest_fiscal_date
+
+    def mark_failure(self, name: str, error: str) -> None:
+        entry = self.entries[name]
+        entry["last_attempt"] = self._clock()
+        entry["failures"] = int(entry.get("failures", 0)) + 1
+        entry["last_error"] = str(error)[:500]
+
+    def summary(self) -> str:
+        now = self._clock()
+        due = sum(1 for e in self.entries.values() if self.priority(e, now) is not None)
+        never = sum(1 for e in self.entries.values() if e.get("last_success") is None)
+        failing = sum(1 for e in self.entries.values() if e.get("failures"))
+        return f"refresh queue: {len(self.entries)} companies, {due} due ({never} never fetched), {failing} failing"
@@ -0,0 +1,158 @@
+"""On-disk, content-addressed cache of Alpha Vantage responses keyed by (function, symbol)."""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ResponseCache:
+    """
+    Response bodies live under ``<root>/objects/<sha256>.json`` and
+    ``<root>/index.json`` maps ``FUNCTION:SYMBOL`` to the current body hash
+    plus the validators (ETag / Last-Modified) and timestamps of that entry.
+
+    An entry younger than ``ttl`` seconds is served without touching the API.
+    Older entries are revalidated: a 304, or a 200 whose body hashes to the
+    same object, only refreshes the timestamp.
+    """
+
+    def __init__(self, root: str = "data/cache", ttl: float = 30 * 86400, clock=time.time):
+        self.root = Path(root)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index_path = self.root / "index.json"
+        self._index = self._load_index()
+        self.stats = {"hit": 0, "miss": 0, "revalidated": 0, "updated": 0}
+
+    def _load_index(self) -> dict:
+        if not self._index_path.exists():
+            return {}
+        try:
+            return json.loads(self._index_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache index {self._index_path}: {e}")
+            return {}
+
+    def _save_index(self) -> None:
+        _atomic_write(self._index_path, json.dumps(self._index, indent=1, sort_keys=True).encode("utf-8"))
+
+    @staticmethod
+    def key(function: str, symbol: str) -> str:
+        return f"{function}:{symbol}".upper()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.json"
+
+    def lookup(self, function: str, symbol: str) -> Optional[dict]:
+        """Index entry for (function, symbol), or None if missing or its object is gone."""
+        with self._lock:
+            entry = self._index.get(self.key(function, symbol))
+        if entry and self._object_path(entry["hash"]).exists():
+            return dict(entry)
+        return None
+
+    def is_fresh(self, entry: dict) -> bool:
+        return self._clock() - entry.get("validated_at", 0) < self.ttl
+
+    @staticmethod
+    def validators(entry: Optional[dict]) -> dict:
+        """Conditional request headers for revalidating ``entry``."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load(self, entry: dict):
+        return json.loads(self._object_path(entry["hash"]).read_text(encoding="utf-8"))
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.stats["hit"] += 1
+
+    def touch(self, function: str, symbol: str) -> None:
+        """Mark an entry as revalidated (server answered 304 Not Modified)."""
+        with self._lock:
+            entry = self._index.get(self.key(function, symbol))
+            if entry:
+                entry["validated_at"] = self._clock()
+                self.stats["revalidated"] += 1
+                self._save_index()
+
+    def expire_symbol(self, symbol: str, older_than: float = 0) -> None:
+        """
+        Force revalidation on next fetch of every cached function for ``symbol``
+        that was last validated more than ``older_than`` seconds ago. The
+        validators are kept, so the next fetch is still a conditional request.
+        """
+        suffix = f":{symbol}".upper()
+        cutoff = self._clock() - older_than
+        with self._lock:
+            for k, entry in self._index.items():
+                if k.endswith(suffix) and entry.get("validated_at", 0) < cutoff:
+                    entry["validated_at"] = 0
+            self._save_index()
+
+    def store(
+        self,
+        function: str,
+        symbol: str,
+        payload,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """
+        Store a freshly fetched payload.
+
+        Returns:
+            (body hash, whether the body differs from the previously cached one)
+        """
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            _atomic_write(path, body)
+        now = self._clock()
+        k = self.key(function, symbol)
+        with self._lock:
+            previous = self._index.get(k)
+            changed = previous is None or previous.get("hash") != digest
+            if previous is None:
+                self.stats["miss"] += 1
+            else:
+                self.stats["updated" if changed else "revalidated"] += 1
+            self._index[k] = {
+                "hash": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now if changed else previous.get("fetched_at", now),
+                "validated_at": now,
+            }
+            self._save_index()
+        return digest, changed
+
+    def report(self) -> str:
+        s = self.stats
+        total = sum(s.values())
+        api_calls = s["miss"] + s["revalidated"] + s["updated"]
+        rate = (s["hit"] / total * 100) if total else 0.0
+        return (
+            f"cache: {s['hit']} hit, {s['miss']} miss, {s['revalidated']} revalidated unchanged, "
+            f"{s['updated']} updated ({rate:.0f}% hit rate, {api_calls} API calls)"
+        )
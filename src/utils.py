@@ -1,8 +1,8 @@
 """Utility functions for parsing and data normalization."""
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from datetime import date, datetime
 import logging
-import requests
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -61,73 +61,291 @@ def parse_number(v) -> Optional[float]:
         logger.debug(f"Failed to parse number '{v}': {e}")
         return None
 
-def normalize_income_statement(data: dict) -> dict:
+# exact strings parse_number maps to None, checked before attempting float()
+_NUMBER_SENTINELS = frozenset(
+    v for s in ("none", "null", "na") for v in (s, s.upper(), s.title())
+) | {"", "-"}
+_ISO_DATE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+
+def parse_numbers(values: Iterable) -> List[Optional[float]]:
     """
-    Normalize field names from Alpha Vantage income statement to canonical form.
-    
-    Args:
-        data: Raw income statement dict from API
-        
-    Returns:
-        Dict with normalized keys: revenue, gross_profit, net_income, currency
+    Batch parse_number over a column of values; same results, element for element.
+
+    Plain numeric strings (the bulk of Alpha Vantage fields) and the "None"
+    sentinel take a fast path; anything float() rejects (commas, currency,
+    parentheses, odd sentinels) goes through parse_number once per distinct
+    string.
     """
-    return {
-        "revenue": parse_number(
-            data.get("totalRevenue") or 
-            data.get("revenues") or 
-            data.get("Revenue")
-        ),
-        "gross_profit": parse_number(
-            data.get("grossProfit") or 
-            data.get("gross_profit")
-        ),
-        "net_income": parse_number(
-            data.get("netIncome") or 
-            data.get("net_income") or 
-            data.get("netIncomeLoss")
-        ),
-        "currency": data.get("reportedCurrency", "USD"),
-    }
+    out: List[Optional[float]] = []
+    memo = {}
+    for v in values:
+        if v is None:
+            out.append(None)
+        elif isinstance(v, str):
+            if v in _NUMBER_SENTINELS:
+                out.append(None)
+                continue
+            # float() accepting the raw string implies parse_number's cleanup was a no-op
+            try:
+                out.append(float(v))
+            except ValueError:
+                if v not in memo:
+                    memo[v] = parse_number(v)
+                out.append(memo[v])
+        else:
+            out.append(parse_number(v))
+    return out
 
-def normalize_balance_sheet(data: dict) -> dict:
+def parse_dates(values: Iterable) -> List[Optional[date]]:
     """
-    Normalize field names from Alpha Vantage balance sheet.
-    
-    Args:
-        data: Raw balance sheet dict from API
-        
-    Returns:
-        Dict with normalized keys: total_assets, total_liabilities, currency
+    Batch parse_date over a column of values; same results, element for element.
+
+    Each distinct string is parsed once; YYYY-MM-DD strings are split with a
+    precompiled pattern instead of strptime, other formats fall back to
+    parse_date.
     """
-    return {
-        "total_assets": parse_number(
-            data.get("totalAssets") or 
-            data.get("total_assets")
-        ),
-        "total_liabilities": parse_number(
-            data.get("totalLiabilities") or 
-            data.get("total_liabilities")
-        ),
-        "currency": data.get("reportedCurrency", "USD"),
-    }
+    out: List[Optional[date]] = []
+    memo = {}
+    for v in values:
+        if not v:
+            out.append(None)
+            continue
+        try:
+            out.append(memo[v])
+            continue
+        except (KeyError, TypeError):
+            pass
+        m = _ISO_DATE.fullmatch(v) if isinstance(v, str) else None
+        parsed = None
+        if m:
+            try:
+                parsed = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            except ValueError:
+                pass
+        if parsed is None:
+            parsed = parse_date(v)
+        try:
+            memo[v] = parsed
+        except TypeError:
+            pass
+        out.append(parsed)
+    return out
 
-def normalize_cash_flow(data: dict) -> dict:
+# Canonical column -> Alpha Vantage field aliases, per statement type. The first
+# alias present in a report with a parseable value wins, so a legitimate 0 is kept.
+FIELD_MAP: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "income_statement": {
+        "revenue": ("totalRevenue", "revenues", "Revenue"),
+        "cost_of_revenue": ("costOfRevenue", "costofGoodsAndServicesSold"),
+        "gross_profit": ("grossProfit", "gross_profit"),
+        "operating_income": ("operatingIncome",),
+        "selling_general_administrative": ("sellingGeneralAndAdministrative",),
+        "research_and_development": ("researchAndDevelopment",),
+        "operating_expenses": ("operatingExpenses",),
+        "investment_income": ("investmentIncomeNet",),
+        "net_interest_income": ("netInterestIncome",),
+        "interest_income": ("interestIncome",),
+        "interest_expense": ("interestExpense",),
+        "non_interest_income": ("nonInterestIncome",),
+        "other_non_operating_income": ("otherNonOperatingIncome",),
+        "depreciation": ("depreciation",),
+        "depreciation_and_amortization": ("depreciationAndAmortization",),
+        "income_before_tax": ("incomeBeforeTax",),
+        "income_tax_expense": ("incomeTaxExpense",),
+        "interest_and_debt_expense": ("interestAndDebtExpense",),
+        "net_income_continuing_operations": ("netIncomeFromContinuingOperations",),
+        "comprehensive_income": ("comprehensiveIncomeNetOfTax",),
+        "ebit": ("ebit",),
+        "ebitda": ("ebitda",),
+        "net_income": ("netIncome", "net_income", "netIncomeLoss"),
+    },
+    "balance_sheet": {
+        "total_assets": ("totalAssets", "total_assets"),
+        "total_current_assets": ("totalCurrentAssets",),
+        "cash_and_equivalents": ("cashAndCashEquivalentsAtCarryingValue",),
+        "cash_and_short_term_investments": ("cashAndShortTermInvestments",),
+        "inventory": ("inventory",),
+        "current_net_receivables": ("currentNetReceivables",),
+        "total_non_current_assets": ("totalNonCurrentAssets",),
+        "property_plant_equipment": ("propertyPlantEquipment",),
+        "accumulated_depreciation": ("accumulatedDepreciationAmortizationPPE",),
+        "intangible_assets": ("intangibleAssets",),
+        "intangible_assets_ex_goodwill": ("intangibleAssetsExcludingGoodwill",),
+        "goodwill": ("goodwill",),
+        "investments": ("investments",),
+        "long_term_investments": ("longTermInvestments",),
+        "short_term_investments": ("shortTermInvestments",),
+        "other_current_assets": ("otherCurrentAssets",),
+        "other_non_current_assets": ("otherNonCurrentAssets",),
+        "total_liabilities": ("totalLiabilities", "total_liabilities"),
+        "total_current_liabilities": ("totalCurrentLiabilities",),
+        "accounts_payable": ("currentAccountsPayable",),
+        "deferred_revenue": ("deferredRevenue",),
+        "current_debt": ("currentDebt",),
+        "short_term_debt": ("shortTermDebt",),
+        "total_non_current_liabilities": ("totalNonCurrentLiabilities",),
+        "capital_lease_obligations": ("capitalLeaseObligations",),
+        "long_term_debt": ("longTermDebt",),
+        "current_long_term_debt": ("currentLongTermDebt",),
+        "long_term_debt_non_current": ("longTermDebtNoncurrent",),
+        "total_debt": ("shortLongTermDebtTotal",),
+        "other_current_liabilities": ("otherCurrentLiabilities",),
+        "other_non_current_liabilities": ("otherNonCurrentLiabilities",),
+        "total_shareholder_equity": ("totalShareholderEquity",),
+        "treasury_stock": ("treasuryStock",),
+        "retained_earnings": ("retainedEarnings",),
+        "common_stock": ("commonStock",),
+        "shares_outstanding": ("commonStockSharesOutstanding",),
+    },
+    "cash_flow_statement": {
+        "operating_cashflow": ("operatingCashflow", "operating_cashflow"),
+        "payments_for_operating_activities": ("paymentsForOperatingActivities",),
+        "proceeds_from_operating_activities": ("proceedsFromOperatingActivities",),
+        "change_in_operating_liabilities": ("changeInOperatingLiabilities",),
+        "change_in_operating_assets": ("changeInOperatingAssets",),
+        "depreciation_depletion_amortization": ("depreciationDepletionAndAmortization",),
+        "capital_expenditures": ("capitalExpenditures",),
+        "change_in_receivables": ("changeInReceivables",),
+        "change_in_inventory": ("changeInInventory",),
+        "profit_loss": ("profitLoss",),
+        "investing_cashflow": ("cashflowFromInvestment",),
+        "financing_cashflow": ("cashflowFromFinancing",),
+        "short_term_debt_net_proceeds": ("proceedsFromRepaymentsOfShortTermDebt",),
+        "common_stock_repurchase": ("paymentsForRepurchaseOfCommonStock",),
+        "equity_repurchase": ("paymentsForRepurchaseOfEquity",),
+        "preferred_stock_repurchase": ("paymentsForRepurchaseOfPreferredStock",),
+        "dividend_payout": ("dividendPayout",),
+        "dividend_payout_common": ("dividendPayoutCommonStock",),
+        "dividend_payout_preferred": ("dividendPayoutPreferredStock",),
+        "common_stock_issuance": ("proceedsFromIssuanceOfCommonStock",),
+        "long_term_debt_issuance": ("proceedsFromIssuanceOfLongTermDebtAndCapitalSecuritiesNet",),
+        "preferred_stock_issuance": ("proceedsFromIssuanceOfPreferredStock",),
+        "equity_repurchase_proceeds": ("proceedsFromRepurchaseOfEquity",),
+        "treasury_stock_sale": ("proceedsFromSaleOfTreasuryStock",),
+        "change_in_cash": ("changeInCashAndCashEquivalents",),
+        "change_in_exchange_rate": ("changeInExchangeRate",),
+        "net_income": ("netIncome",),
+    },
+}
+CURRENCY_FIELD = "reportedCurrency"
+DEFAULT_CURRENCY = "USD"
+
+# columns of FinancialStatement filled by normalize_fields
+STATEMENT_COLUMNS = {
+    "income_statement": ("revenue", "gross_profit", "net_income"),
+    "balance_sheet": ("total_assets", "total_liabilities"),
+    "cash_flow_statement": ("operating_cashflow",),
+}
+
+class ReportNormalizer:
     """
-    Normalize field names from Alpha Vantage cash flow statement.
-    
+    FIELD_MAP of one statement type compiled into a columnar extractor.
+
+    Reports of a statement type share one key layout, so for each distinct
+    ``tuple(report)`` the aliases present for every column are resolved once
+    and reused; a list of reports is then normalized column by column with
+    parse_numbers.
+    """
+
+    def __init__(self, statement_type: str, columns: Optional[Sequence[str]] = None):
+        fields = FIELD_MAP[statement_type]
+        self.statement_type = statement_type
+        self.columns = tuple(fields if columns is None else columns)
+        self._aliases = [fields[c] for c in self.columns]
+        self._layouts: Dict[tuple, tuple] = {}
+
+    def _layout(self, keys: tuple) -> tuple:
+        """Per column, the aliases present in ``keys`` (in alias order)."""
+        layout = self._layouts.get(keys)
+        if layout is None:
+            present = set(keys)
+            layout = self._layouts[keys] = tuple(
+                tuple(a for a in aliases if a in present) for aliases in self._aliases
+            )
+        return layout
+
+    @staticmethod
+    def _currency(report: dict) -> str:
+        currency = report.get(CURRENCY_FIELD)
+        return DEFAULT_CURRENCY if currency is None else currency
+
+    def normalize_reports(self, reports: Sequence[dict]) -> List[dict]:
+        """Normalize ``reports`` in one pass; each result holds every column plus ``currency``."""
+        out = [{} for _ in reports]
+        groups: Dict[tuple, List[int]] = {}
+        for i, report in enumerate(reports):
+            groups.setdefault(self._layout(tuple(report)), []).append(i)
+        for layout, idx in groups.items():
+            batch = [reports[i] for i in idx]
+            for column, aliases in zip(self.columns, layout):
+                if not aliases:
+                    for i in idx:
+                        out[i][column] = None
+                    continue
+                first = aliases[0]
+                values = parse_numbers([r[first] for r in batch])
+                for i, report, value in zip(idx, batch, values):
+                    if value is None:
+                        for alias in aliases[1:]:  # fall back to later aliases
+                            value = parse_number(report[alias])
+                            if value is not None:
+                                break
+                    out[i][column] = value
+        for report, result in zip(reports, out):
+            result["currency"] = self._currency(report)
+        return out
+
+    def __call__(self, report: dict) -> dict:
+        """Normalize one report (scalar path of normalize_reports)."""
+        result = {}
+        for column, aliases in zip(self.columns, self._aliases):
+            value = None
+            for alias in aliases:  # a missing alias parses to None like an empty one
+                value = parse_number(report.get(alias))
+                if value is not None:
+                    break
+            result[column] = value
+        result["currency"] = self._currency(report)
+        return result
+
+_normalizers: Dict[Tuple[str, Optional[tuple]], ReportNormalizer] = {}
+
+def get_normalizer(statement_type: str, columns: Optional[Sequence[str]] = None) -> ReportNormalizer:
+    """Compiled ReportNormalizer for ``statement_type`` (all FIELD_MAP columns by default), built once."""
+    key = (statement_type, None if columns is None else tuple(columns))
+    normalizer = _normalizers.get(key)
+    if normalizer is None:
+        normalizer = _normalizers[key] = ReportNormalizer(statement_type, columns)
+    return normalizer
+
+def normalize_reports(reports: Sequence[dict], statement_type: str, columns: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    Normalize a whole ``annualReports`` list of one statement type in one pass.
+
     Args:
-        data: Raw cash flow dict from API
-        
+        reports: Raw report dicts from the API
+        statement_type: One of 'income_statement', 'balance_sheet', 'cash_flow_statement'
+        columns: Canonical columns to extract (default: every FIELD_MAP column)
+
     Returns:
-        Dict with normalized keys: operating_cashflow, currency
+        One dict per report with the requested columns and ``currency``;
+        an empty dict per report for unknown statement types
     """
-    return {
-        "operating_cashflow": parse_number(
-            data.get("operatingCashflow") or 
-            data.get("operating_cashflow")
-        ),
-        "currency": data.get("reportedCurrency", "USD"),
-    }
+    if statement_type not in FIELD_MAP:
+        return [{} for _ in reports]
+    return get_normalizer(statement_type, columns).normalize_reports(reports)
+
+def normalize_income_statement(data: dict) -> dict:
+    """Normalize an Alpha Vantage income statement: revenue, gross_profit, net_income, currency."""
+    return normalize_fields(data, "income_statement")
+
+def normalize_balance_sheet(data: dict) -> dict:
+    """Normalize an Alpha Vantage balance sheet: total_assets, total_liabilities, currency."""
+    return normalize_fields(data, "balance_sheet")
+
+def normalize_cash_flow(data: dict) -> dict:
+    """Normalize an Alpha Vantage cash flow statement: operating_cashflow, currency."""
+    return normalize_fields(data, "cash_flow_statement")
 
 def normalize_fields(data: dict, statement_type: str) -> dict:
     """
@@ -138,31 +356,12 @@ def normalize_fields(data: dict, statement_type: str) -> dict:
         statement_type: One of 'income_statement', 'balance_sheet', 'cash_flow_statement'
         
     Returns:
-        Dict with normalized field names
+        Dict with the FinancialStatement columns of that type and currency
+        (see normalize_reports for every canonical column)
     """
-    if statement_type == "income_statement":
-        return normalize_income_statement(data)
-    elif statement_type == "balance_sheet":
-        return normalize_balance_sheet(data)
-    elif statement_type == "cash_flow_statement":
-        return normalize_cash_flow(data)
-    return {}
-
-def fetch_data_from_api(api_key, symbol, function, datatype='json'):
-    base_url = "https://www.alphavantage.co/query"
-    params = {
-        'function': function,
-        'symbol': symbol,
-        'apikey': api_key,
-        'datatype': datatype
-    }
-
-    response = requests.get(base_url, params=params)
-
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(f"Error fetching data from API: {response.status_code} - {response.text}")
+    if statement_type not in STATEMENT_COLUMNS:
+        return {}
+    return get_normalizer(statement_type, STATEMENT_COLUMNS[statement_type])(data)
 
 def format_financial_data(data):
     # This function can be expanded to format the financial data as needed
@@ -0,0 +1,26 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+# scripts and the DB layer import "src.x"; the extractor modules use flat imports (they run from src/)
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+# config.py refuses to import without an API key
+os.environ.setdefault("API_KEY", "test")
+
+
+@pytest.fixture
+def dbm(tmp_path):
+    """DBManager on a fresh SQLite file with all tables created."""
+    from sqlalchemy import create_engine
+
+    from src.db_manager import DBManager
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    manager = DBManager(engine)
+    manager.create_tables()
+    yield manager
+    engine.dispose()
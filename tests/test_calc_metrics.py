@@ -0,0 +1,77 @@
+import importlib.util
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models import FinancialStatement
+
+ROOT = Path(__file__).resolve().parents[1]
+
+spec = importlib.util.spec_from_file_location("calc_metrics", ROOT / "scripts" / "calc_metrics.py")
+calc_metrics = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc_metrics)
+
+
+def statements(company_id, year, revenue):
+    fiscal_date = date(year, 12, 31)
+    values = {
+        "income_statement": {"revenue": revenue, "gross_profit": revenue / 2, "net_income": revenue / 10},
+        "balance_sheet": {"total_assets": 1000.0, "total_liabilities": 400.0},
+        "cash_flow_statement": {"operating_cashflow": revenue / 5},
+    }
+    return [
+        dict(company_id=company_id, statement_type=t, fiscal_date=fiscal_date, period="annual", currency="USD", **v)
+        for t, v in values.items()
+    ]
+
+
+@pytest.fixture
+def loaded(dbm, monkeypatch):
+    monkeypatch.setattr(calc_metrics, "engine", dbm.engine)
+    company = dbm.upsert_company("Acme", "ACME")
+    rows = [r for year, revenue in ((2021, 100.0), (2022, 120.0), (2023, 150.0)) for r in statements(company.id, year, revenue)]
+    dbm.sync_financial_statements(rows)
+    return company.id
+
+
+def metric_values(dbm):
+    return {(m.year, m.metric_name): m.value for m in dbm.get_metrics()}
+
+
+def test_rescan_within_the_lag_does_not_bump_the_version(dbm, loaded):
+    calc_metrics.calc_and_persist()
+    version = dbm.get_data_version()
+    before = metric_values(dbm)
+    assert before[(2023, "revenue_yoy")] == pytest.approx(25.0)
+
+    # the default lag re-reads every fact just loaded, but nothing changes
+    calc_metrics.calc_and_persist()
+    assert dbm.get_data_version() == version
+    assert metric_values(dbm) == before
+
+
+def test_only_changed_facts_are_recomputed(dbm, loaded, monkeypatch):
+    monkeypatch.setattr(calc_metrics, "WATERMARK_LAG", timedelta(0))
+    calc_metrics.calc_and_persist()
+    version = dbm.get_data_version()
+
+    dbm.sync_financial_statements(statements(loaded, 2022, 200.0))
+    calc_metrics.calc_and_persist()
+    values = metric_values(dbm)
+    assert values[(2022, "revenue_yoy")] == pytest.approx(100.0)
+    assert values[(2023, "revenue_yoy")] == pytest.approx(-25.0)
+    assert dbm.get_data_version() > version
+
+
+def test_metrics_of_removed_facts_are_deleted(dbm, loaded):
+    calc_metrics.calc_and_persist()
+    with dbm.session() as s:
+        s.query(FinancialStatement).filter_by(fiscal_date=date(2022, 12, 31)).delete()
+    dbm.rebuild_financial_facts()
+
+    calc_metrics.calc_and_persist()
+    values = metric_values(dbm)
+    assert {year for year, _ in values} == {2021, 2023}
+    # 2023 now grows from 2021
+    assert values[(2023, "revenue_yoy")] == pytest.approx(50.0)
@@ -0,0 +1,76 @@
+from alphavantage_client import AlphaVantageClient
+from extractor import Extractor
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+
+COMPANIES = {"Alpha": "AAA", "Beta": "BBB", "Gamma": "CCC"}
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, params):
+        self._payload = {"symbol": params["symbol"], "annualReports": [{"fiscalDateEnding": "2024-12-31"}]}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append((params["symbol"], params["function"]))
+        return FakeResponse(params)
+
+
+def make_client(calls_per_day, cache=None):
+    limiter = RateLimiter(calls_per_minute=10**6, calls_per_day=calls_per_day, margin=0)
+    client = AlphaVantageClient("demo", rate_limiter=limiter, cache=cache)
+    client._session = FakeSession()
+    return client
+
+
+def test_serial_stops_before_a_company_the_budget_cannot_cover(tmp_path):
+    client = make_client(calls_per_day=8)
+    data = Extractor(client, COMPANIES).extract_data()
+    assert list(data) == ["Alpha", "Beta"]
+    # the last two calls of the day are kept instead of being spent on a partial company
+    assert len(client._session.calls) == 6
+    assert client.rate_limiter.remaining_today() == 2
+
+
+def test_fresh_cache_entries_do_not_count_against_the_budget(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache"))
+    warm = make_client(calls_per_day=3, cache=cache)
+    Extractor(warm, {"Gamma": "CCC"}).extract_data()
+
+    client = make_client(calls_per_day=6, cache=cache)
+    data = Extractor(client, COMPANIES).extract_data()
+    assert list(data) == ["Alpha", "Beta", "Gamma"]
+    assert {symbol for symbol, _ in client._session.calls} == {"AAA", "BBB"}
+
+
+def test_concurrent_never_splits_a_company_across_the_budget():
+    client = make_client(calls_per_day=8)
+    data = Extractor(client, COMPANIES, max_workers=4).extract_data()
+    assert list(data) == ["Alpha", "Beta"]
+    assert sorted(client._session.calls) == sorted(
+        (symbol, function) for symbol in ("AAA", "BBB") for function in ("INCOME_STATEMENT", "BALANCE_SHEET", "CASH_FLOW")
+    )
+    assert client.rate_limiter.remaining_today() == 2
+
+
+def test_concurrent_emits_every_company_in_input_order():
+    companies = {f"Company {i}": f"T{i:03d}" for i in range(20)}
+    landed = []
+    client = make_client(calls_per_day=100)
+    extractor = Extractor(client, companies, max_workers=3, sink=lambda name, ticker, statements: landed.append(name))
+    data = extractor.extract_data()
+    assert list(data) == landed == list(companies)
+    assert len(client._session.calls) == 60
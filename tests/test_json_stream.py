@@ -0,0 +1,40 @@
+import io
+import json
+
+import pytest
+
+from src.json_stream import JSONStreamReader
+
+DOC = {
+    "a": [1.5, 2.25e3, -7, 0, -0.125, 1E-5, 12345678901234567890, 3.0e+2],
+    "b": {"x": -1.25e-3, "y": True, "z": None, "s": "1.5e3"},
+    "c": [],
+}
+
+
+def walk(reader):
+    """Rebuild the document through the iter_* / read_value API."""
+    ch = reader.peek()
+    if ch == "{":
+        return {key: walk(reader) for key in reader.iter_object()}
+    if ch == "[":
+        return [walk(reader) for _ in reader.iter_array()]
+    return reader.read_value()
+
+
+@pytest.mark.parametrize("chunk_size", range(1, len(json.dumps(DOC)) + 2))
+def test_numbers_split_at_every_chunk_boundary(chunk_size):
+    reader = JSONStreamReader(io.StringIO(json.dumps(DOC)), chunk_size=chunk_size)
+    assert walk(reader) == DOC
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+def test_reported_document(chunk_size):
+    reader = JSONStreamReader(io.StringIO('{"a": [1.5, 2.25e3, -7]}'), chunk_size=chunk_size)
+    assert walk(reader) == {"a": [1.5, 2250.0, -7]}
+
+
+def test_truncated_number_at_eof_still_fails():
+    reader = JSONStreamReader(io.StringIO("[1."), chunk_size=1)
+    with pytest.raises(ValueError):
+        walk(reader)
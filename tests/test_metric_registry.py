@@ -0,0 +1,38 @@
+import math
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.metric_engine import compute_metrics
+from src.metric_registry import legacy_pct, pct, resolve
+
+
+def series(*values):
+    return pd.Series(values, dtype="float64")
+
+
+def test_pct_keeps_a_real_zero():
+    result = pct(series(0.0, 5.0, 1.0, None), series(10.0, 0.0, None, 4.0))
+    assert result[0] == 0.0
+    assert result[1:].isna().all()
+
+
+def test_legacy_pct_drops_zero_ratios():
+    result = legacy_pct(series(0.0, 5.0, 3.0), series(10.0, 0.0, 4.0))
+    assert result[:2].isna().all()
+    assert result[2] == pytest.approx(75.0)
+
+
+def test_zero_net_income_is_a_zero_roa_but_no_net_margin():
+    frame = pd.DataFrame([{
+        "company_id": 1, "fiscal_date": date(2023, 12, 31),
+        "revenue": 100.0, "gross_profit": 0.0, "net_income": 0.0,
+        "total_assets": 500.0, "total_liabilities": 0.0, "operating_cashflow": 0.0,
+        "has_income_statement": True, "has_balance_sheet": True, "has_cash_flow_statement": True,
+    }])
+    values = compute_metrics(frame, resolve()).set_index("metric_name")["value"]
+    # new metrics store 0%
+    assert values["roa"] == 0.0 and values["debt_ratio"] == 0.0 and values["ocf_margin"] == 0.0
+    # the original metrics keep their stored behaviour
+    assert math.isnan(values["net_margin"]) and math.isnan(values["gross_margin"])
@@ -0,0 +1,60 @@
+from datetime import date
+
+from src.query_cache import QueryCache
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [self.calls]
+
+
+def test_results_are_reused_until_the_version_changes():
+    version = [1]
+    cache, load = QueryCache(lambda: version[0]), Loader()
+    assert cache.get("q", ("a",), load) == [1]
+    assert cache.get("q", ("a",), load) == [1]
+    version[0] = 2
+    assert cache.get("q", ("a",), load) == [2]
+    assert load.calls == 2
+    assert cache.stats["invalidated"] == 1
+
+
+def test_version_is_rechecked_after_the_interval():
+    version, now = [1], [0.0]
+    cache, load = QueryCache(lambda: version[0], check_interval=5, clock=lambda: now[0]), Loader()
+    cache.get("q", (), load)
+    version[0] = 2
+    now[0] = 4.0
+    assert cache.get("q", (), load) == [1]  # stale for at most check_interval
+    now[0] = 5.0
+    assert cache.get("q", (), load) == [2]
+
+
+def test_result_loaded_across_a_version_change_is_not_kept():
+    version = [1]
+    cache = QueryCache(lambda: version[0])
+
+    def load():
+        version[0] += 1  # a write commits while the query runs
+        return "old"
+
+    assert cache.get("q", (), load) == "old"
+    assert cache.get("q", (), lambda: "new") == "new"
+
+
+def test_statement_writes_invalidate_cached_queries(dbm):
+    cache, load = QueryCache(dbm.get_data_version), Loader()
+    company = dbm.upsert_company("Acme", "ACME")
+    row = dict(company_id=company.id, statement_type="income_statement", fiscal_date=date(2023, 12, 31),
+               period="annual", currency="USD", revenue=100.0)
+    cache.get("metrics", (), load)
+    dbm.sync_financial_statements([row])
+    assert cache.get("metrics", (), load) == [2]
+    # an unchanged re-load keeps the cache warm
+    dbm.sync_financial_statements([row])
+    assert cache.get("metrics", (), load) == [2]
+    assert load.calls == 2
@@ -0,0 +1,74 @@
+import pytest
+
+from rate_limiter import DailyQuotaExceeded, RateLimiter
+
+DAY = 86400.0
+T0 = 1_700_000_000.0  # 2023-11-14 22:13:20 UTC
+
+
+class FakeClock:
+    def __init__(self, now=T0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_limiter(tmp_path, clock, **kwargs):
+    kwargs.setdefault("calls_per_minute", 5)
+    kwargs.setdefault("calls_per_day", 25)
+    return RateLimiter(state_path=str(tmp_path / "rl.json"), margin=0, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_reserve_counts_against_the_daily_budget(tmp_path):
+    clock = FakeClock()
+    limiter = make_limiter(tmp_path, clock, calls_per_minute=100, calls_per_day=3)
+    for left in (2, 1, 0):
+        limiter.reserve()
+        assert limiter.remaining_today() == left
+    with pytest.raises(DailyQuotaExceeded):
+        limiter.reserve()
+    assert limiter.remaining_today() == 0
+
+
+def test_budget_persists_across_instances(tmp_path):
+    clock = FakeClock()
+    first = make_limiter(tmp_path, clock, calls_per_day=10)
+    for _ in range(4):
+        first.acquire()
+    second = make_limiter(tmp_path, clock, calls_per_day=10)
+    assert second.remaining_today() == 6
+    # the per-minute window carries over too: the 5th call of this minute is free, the 6th waits
+    assert second.acquire() == 0
+    assert second.acquire() == pytest.approx(60.0)
+
+
+def test_acquire_spaces_calls_per_minute(tmp_path):
+    clock = FakeClock()
+    limiter = make_limiter(tmp_path, clock)
+    waits = [limiter.acquire() for _ in range(7)]
+    assert waits[:5] == [0] * 5
+    assert waits[5] == pytest.approx(60.0)
+    assert waits[6] == 0
+    assert clock.now == pytest.approx(T0 + 60.0)
+
+
+def test_budget_resets_on_a_new_utc_day(tmp_path):
+    clock = FakeClock()
+    limiter = make_limiter(tmp_path, clock, calls_per_day=2)
+    limiter.reserve()
+    limiter.reserve()
+    with pytest.raises(DailyQuotaExceeded):
+        limiter.reserve()
+    clock.now += DAY
+    assert make_limiter(tmp_path, clock, calls_per_day=2).remaining_today() == 2
+    limiter.reserve()
+    assert limiter.remaining_today() == 1
+
+
+def test_unreadable_state_starts_from_a_full_budget(tmp_path):
+    (tmp_path / "rl.json").write_text("{not json", encoding="utf-8")
+    assert make_limiter(tmp_path, FakeClock(), calls_per_day=7).remaining_today() == 7
@@ -0,0 +1,45 @@
+from datetime import date
+
+from src.models import FinancialStatement
+
+
+def report_rows(company_id, revenue=100.0):
+    return [
+        dict(
+            company_id=company_id, statement_type="income_statement", fiscal_date=date(year, 12, 31),
+            period="annual", currency="USD", revenue=revenue * (year - 2020), net_income=10.0,
+            data={"fiscalDateEnding": f"{year}-12-31", "totalRevenue": str(revenue * (year - 2020))},
+        )
+        for year in (2021, 2022, 2023)
+    ]
+
+
+def stored(dbm):
+    with dbm.session() as s:
+        return {r.fiscal_date: (r.revenue, r.fingerprint, r.updated_at) for r in s.query(FinancialStatement)}
+
+
+def test_reloading_unchanged_reports_writes_nothing(dbm):
+    company = dbm.upsert_company("Acme", "ACME")
+    assert dbm.sync_financial_statements(report_rows(company.id)) == {"inserted": 3, "updated": 0, "unchanged": 0}
+    version, before = dbm.get_data_version(), stored(dbm)
+
+    assert dbm.sync_financial_statements(report_rows(company.id)) == {"inserted": 0, "updated": 0, "unchanged": 3}
+    assert stored(dbm) == before
+    assert dbm.get_data_version() == version
+
+
+def test_only_changed_reports_are_rewritten(dbm):
+    company = dbm.upsert_company("Acme", "ACME")
+    dbm.sync_financial_statements(report_rows(company.id))
+    version, before = dbm.get_data_version(), stored(dbm)
+
+    rows = report_rows(company.id)
+    rows[1]["revenue"] = 250.0
+    rows[1]["data"]["totalRevenue"] = "250.0"
+    assert dbm.sync_financial_statements(rows) == {"inserted": 0, "updated": 1, "unchanged": 2}
+    after = stored(dbm)
+    changed = date(2022, 12, 31)
+    assert after[changed][0] == 250.0 and after[changed][1] != before[changed][1]
+    assert {d: v for d, v in after.items() if d != changed} == {d: v for d, v in before.items() if d != changed}
+    assert dbm.get_data_version() > version